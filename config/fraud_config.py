@@ -5,18 +5,45 @@ This module provides centralized configuration for the fraud detection system,
 following Clean Code principles for easy maintenance and modification.
 """
 
-from typing import Dict, List
+from typing import TYPE_CHECKING, Callable, Dict, Final, List
+from dataclasses import dataclass, field
+from bisect import bisect_right
+from functools import lru_cache
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+if TYPE_CHECKING:
+    import numpy as np  # batch lookups import it lazily at call time
+
+# Thresholds resolved once at import; hot paths compare against these directly
+SUSPICIOUS_THRESHOLD: Final[float] = float(os.getenv('FRAUD_SCORE_THRESHOLD', '0.7'))
+HIGH_RISK_THRESHOLD: Final[float] = float(os.getenv('HIGH_RISK_THRESHOLD', '0.9'))
+
+# Level tables as (label, min, max) rows, ordered from lowest to highest
+_RISK_TABLE: Final = (
+    ('LOW', 0.0, 0.3),
+    ('MEDIUM', 0.3, 0.7),
+    ('HIGH', 0.7, 0.9),
+    ('CRITICAL', 0.9, 1.0),
+)
+_CONFIDENCE_TABLE: Final = (
+    ('LOW', 0.0, 0.4),
+    ('MEDIUM', 0.4, 0.7),
+    ('HIGH', 0.7, 1.0),
+)
+
+# Scores are quantized to 1/1000 before lookup so cache keys are small ints
+_SCORE_SCALE = 1000
+
+@dataclass(frozen=True, slots=True)
 class FraudDetectionConfig:
-    """Configuration settings for fraud detection system"""
+    """Configuration settings for fraud detection system (immutable, built once)"""
     
     # Scoring thresholds
-    SUSPICIOUS_THRESHOLD: float = float(os.getenv('FRAUD_SCORE_THRESHOLD', '0.7'))
-    HIGH_RISK_THRESHOLD: float = float(os.getenv('HIGH_RISK_THRESHOLD', '0.9'))
+    SUSPICIOUS_THRESHOLD: float = SUSPICIOUS_THRESHOLD
+    HIGH_RISK_THRESHOLD: float = HIGH_RISK_THRESHOLD
     
     # Detection settings
     MIN_KEYWORD_LENGTH: int = 3
@@ -28,61 +55,106 @@ class FraudDetectionConfig:
     PARTIAL_MATCH_WEIGHT: float = 0.7
     CONTEXT_BONUS: float = 0.2
     
-    # Risk level mappings
-    RISK_LEVELS: Dict[str, tuple] = {
-        'LOW': (0.0, 0.3),
-        'MEDIUM': (0.3, 0.7),
-        'HIGH': (0.7, 0.9),
-        'CRITICAL': (0.9, 1.0)
-    }
-    
-    # Confidence level mappings
-    CONFIDENCE_LEVELS: Dict[str, tuple] = {
-        'LOW': (0.0, 0.4),
-        'MEDIUM': (0.4, 0.7),
-        'HIGH': (0.7, 1.0)
-    }
-    
     # Database settings
-    DATABASE_PATH: str = os.getenv('DATABASE_PATH', 'fraud_monitor.db')
-    BACKUP_ENABLED: bool = os.getenv('BACKUP_ENABLED', 'true').lower() == 'true'
+    DATABASE_PATH: str = field(default_factory=lambda: os.getenv('DATABASE_PATH', 'fraud_monitor.db'))
+    BACKUP_ENABLED: bool = field(default_factory=lambda: os.getenv('BACKUP_ENABLED', 'true').lower() == 'true')
     
     # Logging settings
-    LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
-    LOG_FILE: str = os.getenv('LOG_FILE', 'fraud_detection.log')
+    LOG_LEVEL: str = field(default_factory=lambda: os.getenv('LOG_LEVEL', 'INFO'))
+    LOG_FILE: str = field(default_factory=lambda: os.getenv('LOG_FILE', 'fraud_detection.log'))
     
     # Performance settings
-    BATCH_SIZE: int = int(os.getenv('BATCH_SIZE', '100'))
-    CACHE_SIZE: int = int(os.getenv('CACHE_SIZE', '1000'))
+    BATCH_SIZE: int = field(default_factory=lambda: int(os.getenv('BATCH_SIZE', '100')))
+    CACHE_SIZE: int = field(default_factory=lambda: int(os.getenv('CACHE_SIZE', '1000')))
     
-    @classmethod
-    def get_risk_level(cls, score: float) -> str:
+    # Memoized level lookups keyed on the quantized score (sized by CACHE_SIZE)
+    _risk_level: Callable[[int], str] = field(init=False, repr=False, compare=False)
+    _confidence_level: Callable[[int], str] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Build the cached bisect lookups from the level tables"""
+        object.__setattr__(self, '_risk_level', self._build_level_lookup(_RISK_TABLE))
+        object.__setattr__(self, '_confidence_level', self._build_level_lookup(_CONFIDENCE_TABLE))
+    
+    @property
+    def RISK_LEVELS(self) -> Dict[str, tuple]:
+        """Risk level mappings as {label: (min, max)}"""
+        return {label: (low, high) for label, low, high in _RISK_TABLE}
+    
+    @property
+    def CONFIDENCE_LEVELS(self) -> Dict[str, tuple]:
+        """Confidence level mappings as {label: (min, max)}"""
+        return {label: (low, high) for label, low, high in _CONFIDENCE_TABLE}
+    
+    def _build_level_lookup(self, table: tuple) -> Callable[[int], str]:
+        """
+        Build an LRU-cached lookup from a quantized score to a level label.
+        
+        Upper bounds of every level but the last are bisected, so values at or
+        above the last bound fall into the top level. Call ``cache_clear()`` on
+        the returned function if the underlying table is ever rebuilt.
+        """
+        bounds, labels = self._level_bounds(table)
+        
+        @lru_cache(maxsize=self.CACHE_SIZE)
+        def lookup(quantized: int) -> str:
+            return labels[bisect_right(bounds, quantized)]
+        
+        return lookup
+    
+    @staticmethod
+    def _level_bounds(table: tuple) -> tuple:
+        """Quantized upper bounds (all levels but the last) and labels of a level table"""
+        bounds = [round(high * _SCORE_SCALE) for _, _, high in table[:-1]]
+        return bounds, [label for label, _, _ in table]
+    
+    def _classify_batch(self, table: tuple, scores):
+        """Vectorized counterpart of the bisect lookup for a whole array of scores"""
+        import numpy as np  # only batch callers pay for numpy
+        
+        bounds, labels = self._level_bounds(table)
+        values = np.asarray(scores, dtype=np.float64)
+        # Out-of-range and non-finite scores take the top level, like the scalar lookups
+        in_range = (values >= 0.0) & (values < 1.0)
+        quantized = np.where(in_range, values * _SCORE_SCALE, _SCORE_SCALE).astype(np.int64)
+        return np.asarray(labels)[np.searchsorted(bounds, quantized, side='right')]
+    
+    def get_risk_level(self, score: float) -> str:
         """Get risk level based on fraud score"""
-        for level, (min_score, max_score) in cls.RISK_LEVELS.items():
-            if min_score <= score < max_score:
-                return level
-        return 'CRITICAL'  # For scores >= 1.0
+        # Scores outside [0, 1) (including NaN and +/-inf, which cannot be
+        # quantized) fall into the last bucket (CRITICAL)
+        if not 0.0 <= score < 1.0:
+            return _RISK_TABLE[-1][0]
+        return self._risk_level(int(score * _SCORE_SCALE))
+    
+    def get_risk_levels(self, scores) -> "np.ndarray":
+        """Get risk levels for a batch of fraud scores in one searchsorted call"""
+        return self._classify_batch(_RISK_TABLE, scores)
     
-    @classmethod
-    def get_confidence_level(cls, keyword_count: int, score: float) -> str:
+    def get_confidence_level(self, keyword_count: int, score: float) -> str:
         """Get confidence level based on detection metrics"""
         # Simple confidence calculation based on keyword count and score
-        confidence_score = min((keyword_count * 0.2) + (score * 0.8), 1.0)
+        confidence_score = (keyword_count * 0.2) + (score * 0.8)
+        
+        # Outside [0, 1) (including NaN and +/-inf) is the last level (HIGH)
+        if not 0.0 <= confidence_score < 1.0:
+            return _CONFIDENCE_TABLE[-1][0]
+        return self._confidence_level(int(confidence_score * _SCORE_SCALE))
+    
+    def get_confidence_levels(self, keyword_counts, scores) -> "np.ndarray":
+        """Get confidence levels for batches of keyword counts and fraud scores"""
+        import numpy as np
         
-        for level, (min_conf, max_conf) in cls.CONFIDENCE_LEVELS.items():
-            if min_conf <= confidence_score < max_conf:
-                return level
-        return 'HIGH'  # For confidence >= 1.0
+        confidence_scores = np.minimum(np.asarray(keyword_counts) * 0.2 + np.asarray(scores) * 0.8, 1.0)
+        return self._classify_batch(_CONFIDENCE_TABLE, confidence_scores)
     
-    @classmethod
-    def is_suspicious(cls, score: float) -> bool:
+    def is_suspicious(self, score: float) -> bool:
         """Check if a score indicates suspicious activity"""
-        return score >= cls.SUSPICIOUS_THRESHOLD
+        return score >= self.SUSPICIOUS_THRESHOLD
     
-    @classmethod
-    def is_high_risk(cls, score: float) -> bool:
+    def is_high_risk(self, score: float) -> bool:
         """Check if a score indicates high risk activity"""
-        return score >= cls.HIGH_RISK_THRESHOLD
+        return score >= self.HIGH_RISK_THRESHOLD
 
 # Global configuration instance
 fraud_config = FraudDetectionConfig()
\ No newline at end of file
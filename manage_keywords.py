@@ -8,45 +8,69 @@ Follows Clean Code principles with clear, intuitive commands.
 
 import sys
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__)))
+
+# Running the script already puts its directory on sys.path; only add it
+# when the module is imported from elsewhere, and never more than once
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
 import argparse
+import heapq
 import json
+from functools import cached_property
+from operator import attrgetter
 from typing import List, Dict, Any
 from colorama import Fore, Style, init
 
-# Import our Clean Code fraud detection modules
-from src.fraud_detection.keyword_manager import KeywordManager, FraudCategory
-from src.fraud_detection.detector import FraudDetector
-from src.database.simplified_database import SimplifiedDatabaseManager
+# Initialize colorama; only translate codes on a Windows console and strip
+# them when output is piped or redirected
+_IS_TTY = sys.stdout.isatty()
+init(strip=not _IS_TTY, convert=sys.platform == 'win32' and _IS_TTY)
 
-# Initialize colorama for Windows
-init()
+# Color codes bound once so every print does a plain global lookup; empty
+# when not writing to a terminal so no ANSI sequences are built at all
+if _IS_TTY:
+    _G, _R, _Y, _B, _C = Fore.GREEN, Fore.RED, Fore.YELLOW, Fore.BLUE, Fore.CYAN
+    _RST = Style.RESET_ALL
+else:
+    _G = _R = _Y = _B = _C = _RST = ""
 
 
 class KeywordCLI:
     """Command-line interface for keyword management"""
     
     def __init__(self):
-        self.db = SimplifiedDatabaseManager()
+        # Imported here so `--help` and argument errors never load the
+        # keyword stack
+        from src.fraud_detection.keyword_manager import KeywordManager
+        
         self.keyword_manager = KeywordManager()
-        self.detector = FraudDetector(self.keyword_manager)
+    
+    @cached_property
+    def db(self):
+        """Database manager, opened on first access (no current command needs it)"""
+        from src.database.simplified_database import SimplifiedDatabaseManager
+        
+        return SimplifiedDatabaseManager()
     
     def add_keyword(self, keyword: str, category: str, score: float, description: str = ""):
         """Add a new keyword"""
+        from src.fraud_detection.keyword_manager import FraudCategory
+        
         try:
             fraud_category = FraudCategory(category.lower())
             success = self.keyword_manager.add_keyword(keyword, fraud_category, score, description)
             
             if success:
-                print(f"{Fore.GREEN}✅ Successfully added keyword: '{keyword}'{Style.RESET_ALL}")
+                print(f"{_G}✅ Successfully added keyword: '{keyword}'{_RST}")
                 return True
             else:
-                print(f"{Fore.RED}❌ Failed to add keyword (may already exist){Style.RESET_ALL}")
+                print(f"{_R}❌ Failed to add keyword (may already exist){_RST}")
                 return False
                 
         except ValueError as e:
-            print(f"{Fore.RED}❌ Invalid category '{category}'. Valid categories:{Style.RESET_ALL}")
+            print(f"{_R}❌ Invalid category '{category}'. Valid categories:{_RST}")
             self._print_categories()
             return False
     
@@ -54,77 +78,63 @@ class KeywordCLI:
         """Remove a keyword"""
         success = self.keyword_manager.remove_keyword(keyword)
         if success:
-            print(f"{Fore.GREEN}✅ Successfully removed keyword: '{keyword}'{Style.RESET_ALL}")
+            print(f"{_G}✅ Successfully removed keyword: '{keyword}'{_RST}")
         else:
-            print(f"{Fore.RED}❌ Keyword '{keyword}' not found{Style.RESET_ALL}")
+            print(f"{_R}❌ Keyword '{keyword}' not found{_RST}")
         return success
     
     def update_score(self, keyword: str, new_score: float):
         """Update keyword fraud score"""
         success = self.keyword_manager.update_keyword_score(keyword, new_score)
         if success:
-            print(f"{Fore.GREEN}✅ Successfully updated score for '{keyword}' to {new_score}{Style.RESET_ALL}")
+            print(f"{_G}✅ Successfully updated score for '{keyword}' to {new_score}{_RST}")
         else:
-            print(f"{Fore.RED}❌ Failed to update keyword '{keyword}'{Style.RESET_ALL}")
+            print(f"{_R}❌ Failed to update keyword '{keyword}'{_RST}")
         return success
     
-    def list_keywords(self, category: str = None, min_score: float = None):
+    def list_keywords(self, category: str = None, min_score: float = None, limit: int = None):
         """List keywords with optional filtering"""
+        from src.fraud_detection.keyword_manager import FraudCategory
+        
         if category:
             try:
                 fraud_category = FraudCategory(category.lower())
                 keywords = self.keyword_manager.get_keywords_by_category(fraud_category)
-                print(f"\n{Fore.CYAN}Keywords in category '{category.upper()}':{Style.RESET_ALL}")
+                print(f"\n{_C}Keywords in category '{category.upper()}':{_RST}")
             except ValueError:
-                print(f"{Fore.RED}❌ Invalid category '{category}'{Style.RESET_ALL}")
+                print(f"{_R}❌ Invalid category '{category}'{_RST}")
                 self._print_categories()
                 return
         else:
             keywords = self.keyword_manager.get_all_keywords()
-            print(f"\n{Fore.CYAN}All Keywords:{Style.RESET_ALL}")
+            print(f"\n{_C}All Keywords:{_RST}")
         
-        # Apply score filter
+        # Apply score filter lazily so filtering and selection share one pass
         if min_score is not None:
-            keywords = [kw for kw in keywords if kw.score >= min_score]
-            print(f"{Fore.YELLOW}(Filtered by minimum score: {min_score}){Style.RESET_ALL}")
-        
-        if not keywords:
-            print(f"{Fore.YELLOW}No keywords found matching criteria{Style.RESET_ALL}")
-            return
+            keywords = (kw for kw in keywords if kw.score >= min_score)
+            print(f"{_Y}(Filtered by minimum score: {min_score}){_RST}")
         
         # Sort by score (descending)
-        keywords.sort(key=lambda x: x.score, reverse=True)
+        keywords = self._top_by_score(keywords, limit)
         
-        print(f"\n{'Keyword':<25} {'Category':<15} {'Score':<8} {'Description'}")
-        print("-" * 70)
+        if not keywords:
+            print(f"{_Y}No keywords found matching criteria{_RST}")
+            return
         
-        for kw in keywords:
-            score_color = Fore.RED if kw.score >= 0.8 else Fore.YELLOW if kw.score >= 0.6 else Fore.GREEN
-            print(f"{kw.keyword:<25} {kw.category.value:<15} {score_color}{kw.score:<8.2f}{Style.RESET_ALL} {kw.description}")
+        self._print_keyword_table(keywords)
     
-    def search_keywords(self, search_term: str):
+    def search_keywords(self, search_term: str, limit: int = None):
         """Search keywords by partial match"""
-        keywords = self.keyword_manager.search_keywords(search_term)
+        # Normalize once here instead of inside the keyword manager
+        needle = search_term.lower()
+        keywords = self.keyword_manager.search_keywords(needle, prelowered=True)
         
         if not keywords:
-            print(f"{Fore.YELLOW}No keywords found containing '{search_term}'{Style.RESET_ALL}")
+            print(f"{_Y}No keywords found containing '{search_term}'{_RST}")
             return
         
-        print(f"\n{Fore.CYAN}Keywords containing '{search_term}':{Style.RESET_ALL}")
-        print(f"\n{'Keyword':<25} {'Category':<15} {'Score':<8} {'Description'}")
-        print("-" * 70)
-        
-        for kw in sorted(keywords, key=lambda x: x.score, reverse=True):
-            score_color = Fore.RED if kw.score >= 0.8 else Fore.YELLOW if kw.score >= 0.6 else Fore.GREEN
-            print(f"{kw.keyword:<25} {kw.category.value:<15} {score_color}{kw.score:<8.2f}{Style.RESET_ALL} {kw.description}")
-    
-    def test_detection(self, text: str):
-        """Test fraud detection on sample text"""
-        print(f"\n{Fore.CYAN}Testing fraud detection on text:{Style.RESET_ALL}")
-        print(f"'{text}'\n")
-        
-        result = self.detector.detect_fraud(text)
-        self.detector.print_detection_result(result)
+        print(f"\n{_C}Keywords containing '{search_term}':{_RST}")
+        self._print_keyword_table(self._top_by_score(keywords, limit))
     
     def show_summary(self):
         """Show keyword summary"""
@@ -134,25 +144,65 @@ class KeywordCLI:
         """Export keywords to JSON file"""
         success = self.keyword_manager.export_to_json(file_path)
         if success:
-            print(f"{Fore.GREEN}✅ Keywords exported to '{file_path}'{Style.RESET_ALL}")
+            print(f"{_G}✅ Keywords exported to '{file_path}'{_RST}")
         else:
-            print(f"{Fore.RED}❌ Failed to export keywords{Style.RESET_ALL}")
+            print(f"{_R}❌ Failed to export keywords{_RST}")
     
     def import_keywords(self, file_path: str):
         """Import keywords from JSON file"""
         success = self.keyword_manager.import_from_json(file_path)
         if success:
-            print(f"{Fore.GREEN}✅ Keywords imported from '{file_path}'{Style.RESET_ALL}")
+            print(f"{_G}✅ Keywords imported from '{file_path}'{_RST}")
         else:
-            print(f"{Fore.RED}❌ Failed to import keywords{Style.RESET_ALL}")
+            print(f"{_R}❌ Failed to import keywords{_RST}")
+    
+    @staticmethod
+    def _top_by_score(keywords, limit: int = None) -> list:
+        """Keywords by descending score; heap-selects when only the top `limit` are wanted"""
+        if limit is None:
+            return sorted(keywords, key=attrgetter('score'), reverse=True)
+        return heapq.nlargest(limit, keywords, key=attrgetter('score'))
+    
+    def _print_keyword_table(self, keywords):
+        """Print keywords as a score-colored table with a single write"""
+        red, yellow, green, reset = _R, _Y, _G, _RST
+        
+        rows = [f"\n{'Keyword':<25} {'Category':<15} {'Score':<8} {'Description'}", "-" * 70]
+        rows.extend(
+            f"{kw.keyword:<25} {kw.category.value:<15} "
+            f"{red if kw.score >= 0.8 else yellow if kw.score >= 0.6 else green}{kw.score:<8.2f}{reset} {kw.description}"
+            for kw in keywords
+        )
+        rows.append("")
+        sys.stdout.write("\n".join(rows))
     
     def _print_categories(self):
         """Print available categories"""
-        print(f"\n{Fore.BLUE}Available categories:{Style.RESET_ALL}")
+        from src.fraud_detection.keyword_manager import FraudCategory
+        
+        print(f"\n{_B}Available categories:{_RST}")
         for category in FraudCategory:
             print(f"  • {category.value}")
 
 
+class DetectionCLI(KeywordCLI):
+    """Keyword CLI that also loads the fraud detector (only needed by `test`)"""
+    
+    def __init__(self):
+        super().__init__()
+        from src.fraud_detection.detector import FraudDetector
+        
+        self.detector = FraudDetector(self.keyword_manager)
+    
+    def test_detection(self, text: str):
+        """Test fraud detection on sample text"""
+        print(f"\n{_C}Testing fraud detection on text:{_RST}")
+        print(f"'{text}'\n")
+        
+        result = self.detector.detect_fraud(text)
+        self.detector.print_detection_result(result)
+
+
 def main():
     """Main CLI function"""
     parser = argparse.ArgumentParser(
@@ -166,6 +216,7 @@ Examples:
   python manage_keywords.py list --category scam
   python manage_keywords.py list --min-score 0.7
   python manage_keywords.py search "crypto"
+  python manage_keywords.py search "money" --limit 5
   python manage_keywords.py test "Send me bitcoin for guaranteed profit"
   python manage_keywords.py summary
   python manage_keywords.py export keywords_backup.json
@@ -181,39 +232,53 @@ Examples:
     add_parser.add_argument('category', help='Fraud category')
     add_parser.add_argument('score', type=float, help='Fraud score (0.0-1.0)')
     add_parser.add_argument('description', nargs='?', default='', help='Optional description')
+    add_parser.set_defaults(handler=lambda cli, a: cli.add_keyword(a.keyword, a.category, a.score, a.description))
     
     # Remove keyword
     remove_parser = subparsers.add_parser('remove', help='Remove a keyword')
     remove_parser.add_argument('keyword', help='Keyword to remove')
+    remove_parser.set_defaults(handler=lambda cli, a: cli.remove_keyword(a.keyword))
     
     # Update score
     update_parser = subparsers.add_parser('update', help='Update keyword score')
     update_parser.add_argument('keyword', help='Keyword to update')
     update_parser.add_argument('score', type=float, help='New fraud score (0.0-1.0)')
+    update_parser.set_defaults(handler=lambda cli, a: cli.update_score(a.keyword, a.score))
     
     # List keywords
     list_parser = subparsers.add_parser('list', help='List keywords')
     list_parser.add_argument('--category', help='Filter by category')
     list_parser.add_argument('--min-score', type=float, help='Minimum fraud score')
+    list_parser.add_argument('--limit', type=int, help='Show only the N highest-scoring keywords')
+    list_parser.set_defaults(handler=lambda cli, a: cli.list_keywords(a.category, a.min_score, a.limit))
     
     # Search keywords
     search_parser = subparsers.add_parser('search', help='Search keywords')
     search_parser.add_argument('term', help='Search term')
+    search_parser.add_argument('--limit', type=int, help='Show only the N highest-scoring matches')
+    search_parser.set_defaults(handler=lambda cli, a: cli.search_keywords(a.term, a.limit))
     
     # Test detection
     test_parser = subparsers.add_parser('test', help='Test fraud detection')
     test_parser.add_argument('text', help='Text to analyze')
+    # Only the `test` command needs the detector graph
+    test_parser.set_defaults(handler=lambda cli, a: cli.test_detection(a.text), cli_class=DetectionCLI)
     
     # Show summary
-    subparsers.add_parser('summary', help='Show keywords summary')
+    summary_parser = subparsers.add_parser('summary', help='Show keywords summary')
+    summary_parser.set_defaults(handler=lambda cli, a: cli.show_summary())
     
     # Export keywords
     export_parser = subparsers.add_parser('export', help='Export keywords to JSON')
     export_parser.add_argument('file', help='Output file path')
+    export_parser.set_defaults(handler=lambda cli, a: cli.export_keywords(a.file))
     
     # Import keywords
     import_parser = subparsers.add_parser('import', help='Import keywords from JSON')
     import_parser.add_argument('file', help='Input file path')
+    import_parser.set_defaults(handler=lambda cli, a: cli.import_keywords(a.file))
+    
+    parser.set_defaults(cli_class=KeywordCLI)
     
     args = parser.parse_args()
     
@@ -221,32 +286,15 @@ Examples:
         parser.print_help()
         return
     
-    cli = KeywordCLI()
+    cli = args.cli_class()
     
     try:
-        if args.command == 'add':
-            cli.add_keyword(args.keyword, args.category, args.score, args.description)
-        elif args.command == 'remove':
-            cli.remove_keyword(args.keyword)
-        elif args.command == 'update':
-            cli.update_score(args.keyword, args.score)
-        elif args.command == 'list':
-            cli.list_keywords(args.category, args.min_score)
-        elif args.command == 'search':
-            cli.search_keywords(args.term)
-        elif args.command == 'test':
-            cli.test_detection(args.text)
-        elif args.command == 'summary':
-            cli.show_summary()
-        elif args.command == 'export':
-            cli.export_keywords(args.file)
-        elif args.command == 'import':
-            cli.import_keywords(args.file)
+        args.handler(cli, args)
             
     except KeyboardInterrupt:
-        print(f"\n{Fore.YELLOW}Operation cancelled by user{Style.RESET_ALL}")
+        print(f"\n{_Y}Operation cancelled by user{_RST}")
     except Exception as e:
-        print(f"{Fore.RED}❌ Error: {e}{Style.RESET_ALL}")
+        print(f"{_R}❌ Error: {e}{_RST}")
 
 
 if __name__ == "__main__":
@@ -7,41 +7,166 @@ Uses existing Telegram client infrastructure with minimal dependencies.
 """
 
 import asyncio
+import hashlib
 import logging
+import time
+from collections import OrderedDict
+from bisect import bisect_left
+from functools import lru_cache
+from types import MappingProxyType
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
-from enum import Enum
-import json
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
 
 from telethon import TelegramClient
-from colorama import Fore, Style
+from telethon.errors import FloodWaitError
 
 # Import existing components
 import sys
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+_SRC_DIR = os.path.join(os.path.dirname(__file__), '..')
+if _SRC_DIR not in sys.path:  # reloads must not grow sys.path
+    sys.path.append(_SRC_DIR)
 
 from fraud_detection.detector import FraudDetector, DetectionResult
+from fraud_detection.keyword_manager import KeywordManager
 from media.brand_detector import BrandDetector, BrandMatch
 
+# Number of sub-windows the rate-limit window is split into
+RATE_LIMIT_BUCKETS = 12
 
-class AlertSeverity(Enum):
-    """Alert severity levels"""
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-    CRITICAL = "critical"
+# Outbound alert queue: bounded backlog, paced by token buckets that follow
+# Telegram's limits (~20 msgs/min per chat, ~30 msgs/sec overall)
+ALERT_QUEUE_SIZE = 1000
+ALERT_SENDS_PER_MINUTE = 20
+ALERT_CHAT_BURST = 3
+ALERT_GLOBAL_PER_SECOND = 30
 
+# Most message fingerprints remembered for duplicate suppression
+DEDUP_MAX_ENTRIES = 4096
 
-class AlertType(Enum):
-    """Types of alerts"""
+# Most detection results memoized by message content (reposted scams)
+ANALYSIS_CACHE_SIZE = 10000
+
+
+class AlertSeverity(IntEnum):
+    """Alert severity levels, ordered so severities compare as ints"""
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    CRITICAL = 4
+    
+    @property
+    def label(self) -> str:
+        """Lowercase name ("low", "medium", ...) for display and storage"""
+        return self.name.lower()
+
+
+class AlertType(str, Enum):
+    """Types of alerts (members compare equal to their str values)"""
     FRAUD_ONLY = "fraud_only"
     BRAND_ONLY = "brand_only"
     COMBINED = "combined"  # Both fraud and brand detected
 
 
-@dataclass
+SEVERITY_EMOJI = MappingProxyType({
+    AlertSeverity.LOW: "🟡",
+    AlertSeverity.MEDIUM: "🟠",
+    AlertSeverity.HIGH: "🔴",
+    AlertSeverity.CRITICAL: "🚨"
+})
+DEFAULT_SEVERITY_EMOJI = "⚠️"
+
+# Severity buckets: scores strictly above each threshold move up one level
+_SEVERITY_THRESHOLDS = (0.6, 0.8)
+_SEVERITY_LEVELS = (AlertSeverity.LOW, AlertSeverity.MEDIUM, AlertSeverity.HIGH)
+
+
+# Alert message templates; optional sections are filled in as whole strings
+_TPL_COMBINED = "🎯 **COMBINED THREAT DETECTED**\n"
+_TPL_FRAUD = "🚩 **Fraud Keywords:** {keywords}\n📈 **Fraud Score:** {fraud_score:.2f}\n"
+_TPL_BRANDS = "🏢 **Brands Detected:** {brands}\n"
+_TPL_OCR = "\n🔍 **OCR Text:**\n```\n{ocr}\n```"
+_ALERT_TEMPLATE = (
+    "{emoji} **FRAUD ALERT** - {severity}\n\n"
+    "📍 **Group:** {group}\n"
+    "👤 **Sender:** {sender}{username}\n"
+    "🕐 **Time:** {timestamp:%Y-%m-%d %H:%M:%S}\n"
+    "📊 **Risk Score:** {risk_score:.2f}\n\n"
+    "{combined}{fraud}{brands}"
+    "\n💬 **Message:**\n```\n{message}\n```"
+    "{ocr}"
+)
+
+# Brand risk level -> weight used in the combined risk score
+_RISK_WEIGHTS = MappingProxyType({'low': 0.2, 'medium': 0.5, 'high': 0.8, 'critical': 1.0})
+
+
+def _brand_scores(brand_matches: Optional[List[BrandMatch]]) -> Tuple[float, float]:
+    """Highest brand confidence and highest risk-level weight, in one pass"""
+    best_confidence = 0.0
+    best_risk = 0.0
+    weights = _RISK_WEIGHTS
+    
+    for match in brand_matches or ():
+        if match.confidence > best_confidence:
+            best_confidence = match.confidence
+        weight = weights.get(match.risk_level, 0.0)
+        if weight > best_risk:
+            best_risk = weight
+    
+    return best_confidence, best_risk
+
+
+@lru_cache(maxsize=1)
+def _default_fraud_detector() -> FraudDetector:
+    """Process-wide fraud detector for AlertManagers not given one"""
+    return FraudDetector(KeywordManager())
+
+
+@lru_cache(maxsize=1)
+def _default_brand_detector() -> BrandDetector:
+    """Process-wide brand detector for AlertManagers not given one"""
+    return BrandDetector()
+
+
+def _alert_risk_score(alert_type: "AlertType", fraud_score: float, brand_score: float) -> float:
+    """Risk score of a built alert from its fraud score and best brand confidence"""
+    # Combined scoring with weights
+    if alert_type == AlertType.COMBINED:
+        # Higher weight for combined detection (more suspicious)
+        score = (fraud_score * 0.6) + (brand_score * 0.4) + 0.2
+        return score if score < 1.0 else 1.0
+    if alert_type == AlertType.FRAUD_ONLY:
+        return fraud_score
+    if alert_type == AlertType.BRAND_ONLY:
+        return brand_score * 0.8  # Slightly lower for brand-only
+    return 0.0
+
+
+def _detection_risk_score(fraud_score: float, brand_score: float) -> float:
+    """Combined detection risk from the fraud score and best brand risk weight"""
+    if fraud_score > 0 and brand_score > 0:
+        # Both detected - higher combined risk
+        score = (fraud_score * 0.7) + (brand_score * 0.5)
+        return score if score < 1.0 else 1.0
+    if fraud_score > 0:
+        return fraud_score
+    return brand_score if brand_score > 0 else 0.0
+
+
+async def _resolved(value):
+    """Awaitable that yields value immediately (placeholder for a skipped detector)"""
+    return value
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to limit characters, marking the cut with an ellipsis"""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+@dataclass(slots=True)
 class AlertContext:
     """Context information for alerts"""
     message_id: str
@@ -57,7 +182,7 @@ class AlertContext:
             self.timestamp = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class Alert:
     """Comprehensive alert information"""
     alert_type: AlertType
@@ -66,81 +191,65 @@ class Alert:
     fraud_result: Optional[DetectionResult] = None
     brand_matches: Optional[List[BrandMatch]] = None
     risk_score: float = 0.0
-    alert_message: str = ""
+    _alert_message: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        """Calculate risk score and generate alert message"""
+        """Calculate risk score (the alert message is rendered on first access)"""
         self.risk_score = self._calculate_risk_score()
-        self.alert_message = self._generate_alert_message()
+    
+    @property
+    def alert_message(self) -> str:
+        """Formatted alert message, generated once when first needed"""
+        if self._alert_message is None:
+            self._alert_message = self._generate_alert_message()
+        return self._alert_message
     
     def _calculate_risk_score(self) -> float:
         """Calculate combined risk score from fraud and brand detection"""
         fraud_score = self.fraud_result.fraud_score if self.fraud_result else 0.0
-        brand_score = 0.0
         
-        if self.brand_matches:
-            # Use highest brand confidence as brand score
-            brand_score = max(match.confidence for match in self.brand_matches)
-        
-        # Combined scoring with weights
-        if self.alert_type == AlertType.COMBINED:
-            # Higher weight for combined detection (more suspicious)
-            return min((fraud_score * 0.6) + (brand_score * 0.4) + 0.2, 1.0)
-        elif self.alert_type == AlertType.FRAUD_ONLY:
-            return fraud_score
-        elif self.alert_type == AlertType.BRAND_ONLY:
-            return brand_score * 0.8  # Slightly lower for brand-only
-        
-        return 0.0
+        # Use highest brand confidence as brand score
+        brand_score, _ = _brand_scores(self.brand_matches)
+        
+        return _alert_risk_score(self.alert_type, fraud_score, brand_score)
     
     def _generate_alert_message(self) -> str:
         """Generate formatted alert message"""
-        severity_emoji = {
-            AlertSeverity.LOW: "🟡",
-            AlertSeverity.MEDIUM: "🟠", 
-            AlertSeverity.HIGH: "🔴",
-            AlertSeverity.CRITICAL: "🚨"
-        }
-        
-        emoji = severity_emoji.get(self.severity, "⚠️")
+        context = self.context
+        fraud_result = self.fraud_result
         
-        # Header
-        message = f"{emoji} **FRAUD ALERT** - {self.severity.value.upper()}\n\n"
-        
-        # Context
-        message += f"📍 **Group:** {self.context.group_name}\n"
-        message += f"👤 **Sender:** {self.context.sender_first_name}"
-        if self.context.sender_username:
-            message += f" (@{self.context.sender_username})"
-        message += f"\n🕐 **Time:** {self.context.timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n"
-        message += f"📊 **Risk Score:** {self.risk_score:.2f}\n\n"
-        
-        # Detection details
-        if self.alert_type == AlertType.COMBINED:
-            message += "🎯 **COMBINED THREAT DETECTED**\n"
-        
-        if self.fraud_result and self.fraud_result.is_suspicious:
-            message += f"🚩 **Fraud Keywords:** {', '.join(self.fraud_result.detected_keywords)}\n"
-            message += f"📈 **Fraud Score:** {self.fraud_result.fraud_score:.2f}\n"
+        # Optional sections are rendered only when present
+        fraud_section = ""
+        if fraud_result and fraud_result.is_suspicious:
+            fraud_section = _TPL_FRAUD.format_map({
+                'keywords': ', '.join(fraud_result.detected_keywords),
+                'fraud_score': fraud_result.fraud_score
+            })
         
+        brands_section = ""
         if self.brand_matches:
-            brands = [f"{match.brand} ({match.confidence:.2f})" for match in self.brand_matches]
-            message += f"🏢 **Brands Detected:** {', '.join(brands)}\n"
+            brands_section = _TPL_BRANDS.format_map({
+                'brands': ', '.join(f"{match.brand} ({match.confidence:.2f})" for match in self.brand_matches)
+            })
         
-        # Message content
-        message += f"\n💬 **Message:**\n```\n{self.context.message_text[:500]}"
-        if len(self.context.message_text) > 500:
-            message += "..."
-        message += "\n```"
+        ocr_section = ""
+        if context.ocr_text:
+            ocr_section = _TPL_OCR.format_map({'ocr': _truncate(context.ocr_text, 300)})
         
-        # OCR content if available
-        if self.context.ocr_text:
-            message += f"\n🔍 **OCR Text:**\n```\n{self.context.ocr_text[:300]}"
-            if len(self.context.ocr_text) > 300:
-                message += "..."
-            message += "\n```"
-        
-        return message
+        return _ALERT_TEMPLATE.format_map({
+            'emoji': SEVERITY_EMOJI.get(self.severity, DEFAULT_SEVERITY_EMOJI),
+            'severity': self.severity.name,
+            'group': context.group_name,
+            'sender': context.sender_first_name,
+            'username': f" (@{context.sender_username})" if context.sender_username else "",
+            'timestamp': context.timestamp,
+            'risk_score': self.risk_score,
+            'combined': _TPL_COMBINED if self.alert_type == AlertType.COMBINED else "",
+            'fraud': fraud_section,
+            'brands': brands_section,
+            'message': _truncate(context.message_text, 500),
+            'ocr': ocr_section
+        })
 
 
 class AlertManager:
@@ -151,21 +260,24 @@ class AlertManager:
     via Telegram using existing client infrastructure.
     """
     
-    def __init__(self, telegram_client=None, alert_chat_id: str = None):
+    def __init__(self, telegram_client=None, alert_chat_id: str = None,
+                 fraud_detector: Optional[FraudDetector] = None,
+                 brand_detector: Optional[BrandDetector] = None):
         """
         Initialize AlertManager.
         
         Args:
             telegram_client: Telegram client instance for sending alerts
             alert_chat_id: Chat ID to send alerts to (defaults to 'me')
+            fraud_detector: Fraud detector to reuse (defaults to a shared instance)
+            brand_detector: Brand detector to reuse (defaults to a shared instance)
         """
         # Initialize logging
         self.logger = logging.getLogger(__name__)
         
         # Initialize Telegram client
         if telegram_client is None:
-            # Import and create Telegram client
-            from telethon import TelegramClient
+            # Create Telegram client
             from dotenv import load_dotenv
             
             load_dotenv()
@@ -185,26 +297,40 @@ class AlertManager:
             
         self.alert_chat_id = alert_chat_id or "me"
         
-        # Initialize detection systems
-        sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-        from fraud_detection.keyword_manager import KeywordManager
-        keyword_manager = KeywordManager()
-        self.fraud_detector = FraudDetector(keyword_manager)
-        self.brand_detector = BrandDetector()
+        # Initialize detection systems (shared across managers unless given)
+        self.fraud_detector = fraud_detector or _default_fraud_detector()
+        self.brand_detector = brand_detector or _default_brand_detector()
+        self.fraud_detector.precompile()
         
         # Alert configuration
         self.min_alert_score = 0.3  # Minimum score to trigger alert
         self.rate_limit_window = timedelta(minutes=5)  # Rate limiting window
+        self._window_seconds = self.rate_limit_window.total_seconds()  # Same window as float for hot paths
         self.max_alerts_per_window = 10  # Max alerts per window
         
-        # Rate limiting tracking
-        self.recent_alerts: List[datetime] = []
+        # Rate limiting tracking: sliding-window counter of alerts per sub-window
+        self._reset_rate_limit()
+        
+        # Fingerprints of recently alerted content -> monotonic time, oldest first
+        self._seen: "OrderedDict[bytes, float]" = OrderedDict()
+        
+        # Detection results keyed on (content fingerprint, keyword version,
+        # brand version) -> (fraud result, brand matches), least recent first
+        self._analysis_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        
+        # Outbound queue drained by a background flusher (started on first alert)
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher_task: Optional[asyncio.Task] = None
+        
+        # Send pacing: chat -> (tokens, last refill), a global bucket, and a
+        # monotonic deadline set by Telegram flood waits
+        self._chat_buckets: Dict[str, Tuple[float, float]] = {}
+        self._global_bucket: Tuple[float, float] = (float(ALERT_GLOBAL_PER_SECOND), time.monotonic())
+        self._backoff_until = 0.0
         
         # Statistics
         self.alerts_sent = 0
         self.alerts_suppressed = 0
-        
-        self.logger = logging.getLogger(__name__)
     
     async def analyze_and_alert(self, context: AlertContext) -> Optional[Alert]:
         """
@@ -217,15 +343,45 @@ class AlertManager:
             Alert object if alert was generated and sent, None otherwise
         """
         try:
-            # Always run fraud detection
-            fraud_result = self.fraud_detector.detect_fraud(context.message_text)
+            # Lowercase each text once; both detectors reuse it
+            message_lower = context.message_text.lower()
             
-            # Run brand detection on combined text
+            # Build the combined buffer used for brand detection
             combined_text = context.message_text
+            combined_lower = message_lower
             if context.ocr_text:
                 combined_text += " " + context.ocr_text
-                
-            brand_matches = self.brand_detector.detect_brands(combined_text)
+                combined_lower += " " + context.ocr_text.lower()
+            
+            # Skip detectors whose keywords or brand names do not occur in the text
+            fraud_possible = self.fraud_detector.could_match(message_lower)
+            brands_possible = self.brand_detector.could_match(combined_text, combined_lower)
+            if not fraud_possible and not brands_possible:
+                return None
+            
+            # Reposted content reuses the results of its first analysis
+            fingerprint = self._content_fingerprint(context.message_text, context.ocr_text)
+            cache_key = (
+                fingerprint,
+                self.fraud_detector.keyword_manager.version,
+                self.brand_detector.version
+            )
+            cached = self._analysis_cache.get(cache_key)
+            if cached is not None:
+                self._analysis_cache.move_to_end(cache_key)
+                fraud_result, brand_matches = cached
+            else:
+                # Run fraud detection (message text) and brand detection (combined text)
+                # in worker threads so they overlap and keep the event loop free
+                fraud_result, brand_matches = await asyncio.gather(
+                    asyncio.to_thread(self.fraud_detector.detect_fraud, context.message_text, None, message_lower)
+                    if fraud_possible else _resolved(None),
+                    asyncio.to_thread(self.brand_detector.detect_brands, combined_text, combined_lower)
+                    if brands_possible else _resolved([])
+                )
+                self._analysis_cache[cache_key] = (fraud_result, brand_matches)
+                if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                    self._analysis_cache.popitem(last=False)
             
             # Calculate combined risk score
             risk_score = self._calculate_risk_score(fraud_result, brand_matches)
@@ -254,6 +410,10 @@ class AlertManager:
                     severity = self._determine_severity(risk_score, has_brands=True)
             
             if should_alert:
+                # Suppressed alerts are dropped before an Alert is even built
+                if self.telegram_client and self._suppressed(fingerprint):
+                    return None
+                
                 # Create alert
                 alert = Alert(
                     alert_type=alert_type,
@@ -264,17 +424,8 @@ class AlertManager:
                     risk_score=risk_score
                 )
                 
-                # Send alert
+                # Queue alert for delivery
                 if self.telegram_client:
-                    # Ensure Telegram client is connected
-                    if not self.telegram_client.is_connected():
-                        if hasattr(self, '_client_needs_start') and self._client_needs_start:
-                            await self.telegram_client.start(phone=self.phone_number)
-                            self.logger.info("Telegram client connected for alerts")
-                        else:
-                            await self.telegram_client.connect()
-                            self.logger.info("Telegram client reconnected for alerts")
-                    
                     success = await self.send_alert(alert)
                     if success:
                         return alert
@@ -284,96 +435,253 @@ class AlertManager:
             return None
             
         except Exception as e:
-            self.logger.error(f"Error in analyze_and_alert: {e}")
+            self.logger.error("Error in analyze_and_alert: %s", e)
             return None
     
     def _calculate_risk_score(self, fraud_result: Optional[DetectionResult], brand_matches: Optional[List[BrandMatch]]) -> float:
         """Calculate combined risk score from fraud and brand detection"""
         fraud_score = fraud_result.fraud_score if fraud_result else 0.0
-        brand_score = 0.0
-        
-        if brand_matches:
-            # Calculate brand risk based on highest risk brand
-            risk_weights = {'low': 0.2, 'medium': 0.5, 'high': 0.8, 'critical': 1.0}
-            brand_score = max([risk_weights.get(match.risk_level, 0.0) for match in brand_matches], default=0.0)
-        
-        # Combine scores with weighted average
-        if fraud_score > 0 and brand_score > 0:
-            # Both detected - higher combined risk
-            return min(1.0, (fraud_score * 0.7) + (brand_score * 0.5))
-        elif fraud_score > 0:
-            return fraud_score
-        elif brand_score > 0:
-            return brand_score
-        else:
-            return 0.0
+        
+        # Calculate brand risk based on highest risk brand
+        _, brand_score = _brand_scores(brand_matches)
+        
+        return _detection_risk_score(fraud_score, brand_score)
 
     def _determine_severity(self, risk_score: float, has_brands: bool = False) -> AlertSeverity:
         """Determine alert severity based on risk score and brand presence"""
         if has_brands and risk_score > 0.7:
             return AlertSeverity.CRITICAL
-        elif risk_score > 0.8:
-            return AlertSeverity.HIGH
-        elif risk_score > 0.6:
-            return AlertSeverity.MEDIUM
+        # bisect_left keeps the boundaries exclusive (0.8 is MEDIUM, not HIGH)
+        return _SEVERITY_LEVELS[bisect_left(_SEVERITY_THRESHOLDS, risk_score)]
+
+    def _reset_rate_limit(self):
+        """Start a fresh sliding window (all sub-window counts zeroed)"""
+        self._buckets: List[int] = [0] * RATE_LIMIT_BUCKETS
+        self._bucket_start = time.monotonic()
+        self._last_bucket = 0
+
+    def _current_bucket(self) -> int:
+        """Advance the window to now, zeroing sub-windows that slid out, and return the current slot"""
+        bucket_width = self._window_seconds / RATE_LIMIT_BUCKETS
+        bucket = int((time.monotonic() - self._bucket_start) / bucket_width)
+        
+        elapsed = bucket - self._last_bucket
+        if elapsed >= RATE_LIMIT_BUCKETS:
+            self._buckets = [0] * RATE_LIMIT_BUCKETS
         else:
-            return AlertSeverity.LOW
+            for expired in range(self._last_bucket + 1, bucket + 1):
+                self._buckets[expired % RATE_LIMIT_BUCKETS] = 0
+        
+        self._last_bucket = bucket
+        return bucket % RATE_LIMIT_BUCKETS
+
+    def _recent_alert_count(self) -> int:
+        """Alerts sent within the current rate-limit window"""
+        self._current_bucket()
+        return sum(self._buckets)
 
     def _should_send_alert(self) -> bool:
         """Check if we should send an alert based on rate limiting"""
-        now = datetime.now()
+        return self._recent_alert_count() < self.max_alerts_per_window
+
+    @staticmethod
+    def _fingerprint(alert: Alert) -> bytes:
+        """Content fingerprint of the alerted message (text plus OCR text)"""
+        return AlertManager._content_fingerprint(alert.context.message_text, alert.context.ocr_text)
+
+    @staticmethod
+    def _content_fingerprint(message_text: str, ocr_text: Optional[str]) -> bytes:
+        """16-byte blake2b digest of message text and OCR text"""
+        digest = hashlib.blake2b(message_text.encode('utf-8'), digest_size=16)
+        if ocr_text:
+            digest.update(b"\x00")
+            digest.update(ocr_text.encode('utf-8'))
+        return digest.digest()
+
+    def _is_duplicate(self, fingerprint: bytes) -> bool:
+        """Check whether the same content was already alerted within the rate-limit window"""
+        cutoff = time.monotonic() - self._window_seconds
+        seen = self._seen
         
-        # Clean old alerts outside the window
-        cutoff = now - self.rate_limit_window
-        self.recent_alerts = [alert_time for alert_time in self.recent_alerts if alert_time > cutoff]
+        # Entries are in insertion order, so expired ones sit at the front
+        while seen:
+            oldest = next(iter(seen))
+            if seen[oldest] > cutoff:
+                break
+            del seen[oldest]
         
-        # Check if we're at the limit
-        return len(self.recent_alerts) < self.max_alerts_per_window
+        return fingerprint in seen
+
+    def _remember(self, fingerprint: bytes):
+        """Record alerted content, evicting the oldest fingerprint when full"""
+        self._seen[fingerprint] = time.monotonic()
+        self._seen.move_to_end(fingerprint)
+        if len(self._seen) > DEDUP_MAX_ENTRIES:
+            self._seen.popitem(last=False)
 
     def _update_rate_limit(self):
         """Update rate limiting tracking"""
-        self.recent_alerts.append(datetime.now())
-        self.alerts_sent += 1
+        self._buckets[self._current_bucket()] += 1
 
+    def _suppressed(self, fingerprint: bytes) -> bool:
+        """Count and log an alert that must not go out (duplicate or rate limited)"""
+        # Skip content already alerted (e.g. spam reposted across groups)
+        if self._is_duplicate(fingerprint):
+            self.logger.info("Alert suppressed as a duplicate")
+        # Check rate limiting
+        elif not self._should_send_alert():
+            self.logger.info("Alert suppressed due to rate limiting")
+        else:
+            return False
+        
+        self.alerts_suppressed += 1
+        return True
+    
     async def send_alert(self, alert: Alert) -> bool:
         """
-        Send alert via Telegram.
+        Queue alert for delivery via Telegram.
+        
+        The alert is handed to the background flusher, so this returns without
+        waiting on the network.
         
         Args:
             alert: Alert object to send
             
         Returns:
-            bool: True if sent successfully, False otherwise
+            bool: True if queued, False if suppressed or the queue is full
         """
         try:
-            # Check rate limiting
-            if not self._should_send_alert():
-                self.logger.info("Alert suppressed due to rate limiting")
-                self.alerts_suppressed += 1
+            fingerprint = self._fingerprint(alert)
+            if self._suppressed(fingerprint):
                 return False
             
-            # Format message
-            message = alert.alert_message
+            self._ensure_flusher()
+            self._queue.put_nowait(alert)
             
-            # Send to yourself (Saved Messages)
-            await self.telegram_client.send_message('me', message)
-            
-            # Update rate limiting
+            # Update rate limiting and duplicate tracking
             self._update_rate_limit()
+            self._remember(fingerprint)
+            return True
+            
+        except asyncio.QueueFull:
+            self.logger.warning("Alert dropped: outbound queue is full")
+            self.alerts_suppressed += 1
+            return False
+        except Exception as e:
+            self.logger.error("Failed to queue alert: %s", e)
+            return False
+    
+    def _ensure_flusher(self):
+        """Create the outbound queue and start its flusher task on first use"""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=ALERT_QUEUE_SIZE)
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = asyncio.create_task(self._flusher())
+    
+    async def _ensure_connected(self):
+        """Connect (or start) the Telegram client if it dropped"""
+        if not self.telegram_client.is_connected():
+            if self._client_needs_start:
+                await self.telegram_client.start(phone=self.phone_number)
+                self.logger.info("Telegram client connected for alerts")
+            else:
+                await self.telegram_client.connect()
+                self.logger.info("Telegram client reconnected for alerts")
+    
+    async def _do_send(self, alert: Alert) -> bool:
+        """
+        Deliver one alert via Telegram, waiting out flood limits.
+        
+        Args:
+            alert: Alert object to send
             
-            self.logger.info(f"Alert sent successfully: {alert.alert_type.value}")
+        Returns:
+            bool: True if sent successfully, False otherwise
+        """
+        # Send to yourself (Saved Messages)
+        chat = 'me'
+        
+        try:
+            while True:
+                await self._acquire_send_slot(chat)
+                try:
+                    await self._ensure_connected()
+                    await self.telegram_client.send_message(chat, alert.alert_message)
+                    break
+                except FloodWaitError as e:
+                    # Hold every send until Telegram's retry-after passes, then retry this one
+                    self.logger.warning("Flood wait while sending alert, retrying in %ss", e.seconds)
+                    self._backoff_until = time.monotonic() + e.seconds
+            
+            self.alerts_sent += 1
+            self.logger.info("Alert sent successfully: %s", alert.alert_type.value)
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to send alert: {e}")
+            self.logger.error("Failed to send alert: %s", e)
             return False
     
+    async def _acquire_send_slot(self, chat: str):
+        """Wait until a flood wait has passed and both the chat and global buckets hold a token"""
+        chat_rate = ALERT_SENDS_PER_MINUTE / 60
+        global_rate = float(ALERT_GLOBAL_PER_SECOND)
+        
+        while True:
+            now = time.monotonic()
+            if now < self._backoff_until:
+                await asyncio.sleep(self._backoff_until - now)
+                continue
+            
+            # Refill both buckets for the time elapsed since their last update
+            chat_tokens, chat_refill = self._chat_buckets.get(chat, (float(ALERT_CHAT_BURST), now))
+            chat_tokens = min(float(ALERT_CHAT_BURST), chat_tokens + (now - chat_refill) * chat_rate)
+            global_tokens, global_refill = self._global_bucket
+            global_tokens = min(global_rate, global_tokens + (now - global_refill) * global_rate)
+            
+            if chat_tokens >= 1.0 and global_tokens >= 1.0:
+                self._chat_buckets[chat] = (chat_tokens - 1.0, now)
+                self._global_bucket = (global_tokens - 1.0, now)
+                return
+            
+            self._chat_buckets[chat] = (chat_tokens, now)
+            self._global_bucket = (global_tokens, now)
+            await asyncio.sleep(max((1.0 - chat_tokens) / chat_rate, (1.0 - global_tokens) / global_rate))
+    
+    async def _flusher(self):
+        """Consume the outbound queue, sending one alert at a time as tokens allow"""
+        while True:
+            alert = await self._queue.get()
+            try:
+                await self._do_send(alert)
+            finally:
+                self._queue.task_done()
+    
+    async def close(self, timeout: float = 30.0):
+        """
+        Flush queued alerts and stop the flusher task.
+        
+        Args:
+            timeout: Seconds to wait for pending alerts before giving up on them
+        """
+        if self._flusher_task is None:
+            return
+        
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning("Discarding %d unsent alerts on shutdown", self._queue.qsize())
+        
+        self._flusher_task.cancel()
+        await asyncio.gather(self._flusher_task, return_exceptions=True)
+        self._flusher_task = None
+    
     def get_statistics(self) -> Dict:
         """Get alert system statistics"""
         return {
             "alerts_sent": self.alerts_sent,
             "alerts_suppressed": self.alerts_suppressed,
-            "recent_alerts_count": len(self.recent_alerts),
+            "alerts_queued": self._queue.qsize() if self._queue else 0,
+            "recent_alerts_count": self._recent_alert_count(),
             "rate_limit_window_minutes": self.rate_limit_window.total_seconds() / 60,
             "max_alerts_per_window": self.max_alerts_per_window,
             "min_alert_score": self.min_alert_score
@@ -389,6 +697,9 @@ class AlertManager:
         
         if "rate_limit_minutes" in kwargs:
             self.rate_limit_window = timedelta(minutes=max(1, kwargs["rate_limit_minutes"]))
+            self._window_seconds = self.rate_limit_window.total_seconds()
+            # Sub-window width changed, so existing counts no longer line up
+            self._reset_rate_limit()
         
         self.logger.info("Alert configuration updated")
 
@@ -396,6 +707,8 @@ class AlertManager:
 # Utility functions for easy integration
 async def send_test_alert(telegram_client: TelegramClient, target_chat: str = "me"):
     """Send a test alert to verify the system works"""
+    from colorama import Fore
+    
     test_context = AlertContext(
         message_id="test_123",
         group_name="Test Group",
@@ -406,11 +719,13 @@ async def send_test_alert(telegram_client: TelegramClient, target_chat: str = "m
     
     alert_manager = AlertManager(telegram_client)
     alert = await alert_manager.analyze_and_alert(test_context)
+    # Wait for the queued alert to actually go out
+    await alert_manager.close()
     
     if alert:
         print(f"{Fore.GREEN}✅ Test alert sent successfully!")
         print(f"Alert type: {alert.alert_type.value}")
-        print(f"Severity: {alert.severity.value}")
+        print(f"Severity: {alert.severity.label}")
         print(f"Risk score: {alert.risk_score:.2f}")
     else:
         print(f"{Fore.YELLOW}⚠️ No alert generated (may be below threshold)")
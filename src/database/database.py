@@ -1,39 +1,175 @@
 import asyncio
 import logging
-import json
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, AsyncIterator
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import selectinload
-from sqlalchemy import select, update, and_
-from colorama import Fore, Style
+from sqlalchemy.orm import joinedload, raiseload
+from sqlalchemy import Integer, select, insert, update, and_, event, bindparam, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from .models import Base, TelegramGroup, User, Message, MediaFile, FraudDetection, FraudKeyword, MonitoringSession
 
+# Per-connection SQLite tuning: WAL journal with NORMAL sync (no fsync per
+# commit, readers don't block the writer), in-memory temp tables, a 64 MB
+# page cache and 256 MB of memory-mapped I/O
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Warm connections kept per engine (file-backed SQLite defaults to NullPool,
+# which reopens the file and loses its page cache on every session)
+DB_POOL_SIZE = 5
+DB_MAX_OVERFLOW = 10
+SQLITE_CACHED_STATEMENTS = 256
+
+# Stored in SQLite's PRAGMA user_version once the schema is created; bump it
+# whenever models.py gains tables or indexes so existing databases catch up
+SCHEMA_VERSION = 1
+
+# Queued fraud detections are written in batches of up to this many rows,
+# at most this many seconds after the first row of a batch arrived
+FRAUD_BATCH_SIZE = 100
+FRAUD_FLUSH_INTERVAL = 0.2
+
+# Session counters passed to add_session_stats are written at most this often
+SESSION_STATS_FLUSH_INTERVAL = 0.5
+
+# Telegram group/user id -> primary key entries kept in memory per manager
+PK_CACHE_SIZE = 10000
+
+def _engine_options(database_url: str) -> Dict[str, Any]:
+    """Pool and driver arguments for create_async_engine (in-memory SQLite keeps its StaticPool)"""
+    url = make_url(database_url)
+    is_sqlite = url.get_backend_name() == 'sqlite'
+    
+    options: Dict[str, Any] = {}
+    if is_sqlite:
+        # Room in sqlite3's per-connection prepared-statement cache for every hot
+        # statement; connections move between aiosqlite worker threads
+        options['connect_args'] = {'cached_statements': SQLITE_CACHED_STATEMENTS, 'check_same_thread': False}
+        if url.database in (None, '', ':memory:'):
+            return options
+    
+    # A local SQLite file cannot drop the connection, so skip the pre-ping
+    options.update({'pool_size': DB_POOL_SIZE, 'max_overflow': DB_MAX_OVERFLOW, 'pool_pre_ping': False})
+    if is_sqlite:
+        options['poolclass'] = AsyncAdaptedQueuePool
+    return options
+
+def _upsert(model, key: str, columns: Tuple[str, ...]):
+    """INSERT of `columns` (bound by name) that leaves an existing row unchanged"""
+    stmt = sqlite_insert(model).values({column: bindparam(column) for column in columns})
+    # No-op update so RETURNING also yields an existing row
+    return stmt.on_conflict_do_update(index_elements=[key], set_={key: stmt.excluded[key]})
+
+# Hot statements, built once instead of per call; values are bound at execute time
+_GROUP_COLUMNS = ('group_id', 'group_name', 'group_username')
+_USER_COLUMNS = ('user_id', 'username', 'first_name', 'last_name', 'phone_number', 'is_bot')
+_GROUP_UPSERT = _upsert(TelegramGroup, 'group_id', _GROUP_COLUMNS)
+_USER_UPSERT = _upsert(User, 'user_id', _USER_COLUMNS)
+_GROUP_UPSERT_ID = _GROUP_UPSERT.returning(TelegramGroup.id)
+_USER_UPSERT_ID = _USER_UPSERT.returning(User.id)
+_GROUP_UPSERT_ROW = _GROUP_UPSERT.returning(TelegramGroup)
+_USER_UPSERT_ROW = _USER_UPSERT.returning(User)
+
+_ACTIVE_KEYWORDS = select(FraudKeyword).where(FraudKeyword.is_active == True)
+
+_RECENT_MESSAGES = (
+    select(Message)
+    # Many-to-one parents come back in the same JOINed query; anything
+    # not loaded here raises instead of lazy loading per row
+    .options(joinedload(Message.group), joinedload(Message.sender), raiseload('*'))
+    # id breaks processed_at ties; the processed_at index already ends in rowid
+    .order_by(Message.processed_at.desc(), Message.id.desc())
+    .limit(bindparam('limit'))
+)
+
+# Next page after a (processed_at, id) keyset cursor: an index seek, unlike OFFSET.
+# The binds are typed so the cursor datetime goes through SQLAlchemy's DateTime
+# processor (always six fractional digits, like the stored text); sqlite3's own
+# adapter drops the fraction when microsecond == 0 and the comparison skips rows
+_RECENT_MESSAGES_BEFORE = _RECENT_MESSAGES.where(
+    tuple_(Message.processed_at, Message.id) < tuple_(
+        bindparam('before_at', type_=Message.processed_at.type),
+        bindparam('before_id', type_=Integer),
+    )
+)
+
+def _create_missing_indexes(connection):
+    """Create model indexes absent from an existing database (create_all skips existing tables)"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS to every new DBAPI connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 class DatabaseManager:
     """Manages all database operations for the fraud monitor"""
     
     def __init__(self, database_url: str = "sqlite+aiosqlite:///fraud_monitor.db"):
         self.database_url = database_url
-        self.engine = create_async_engine(database_url, echo=False)
+        self.engine = create_async_engine(database_url, echo=False, **_engine_options(database_url))
+        if self.engine.dialect.name == 'sqlite':
+            event.listen(self.engine.sync_engine, "connect", _set_sqlite_pragmas)
         self.async_session = async_sessionmaker(self.engine, expire_on_commit=False)
         self.logger = logging.getLogger(__name__)
         
+        # Primary keys of known groups and users by Telegram id, least recent first
+        self._group_pks: "OrderedDict[str, int]" = OrderedDict()
+        self._user_pks: "OrderedDict[str, int]" = OrderedDict()
+        
+        # Fraud detections awaiting a batched insert (started on first use)
+        self._fraud_queue: Optional[asyncio.Queue] = None
+        self._fraud_flusher: Optional[asyncio.Task] = None
+        
+        # Active fraud keywords, loaded on first use (None until then or after invalidation)
+        self._keyword_cache: Optional[Tuple[FraudKeyword, ...]] = None
+        
+        # Session counter deltas awaiting a write: session id -> [messages, images, alerts]
+        self._pending_stats: Dict[int, List[int]] = {}
+        self._stats_flusher: Optional[asyncio.Task] = None
+        # Set by close() to stop the flusher after its current write (never cancelled mid-flush)
+        self._stats_stop = asyncio.Event()
+        
     async def initialize_database(self):
         """Initialize database tables and default data"""
         try:
-            # Create all tables
+            # Create all tables (this also opens the first pooled connection); SQLite
+            # databases already at SCHEMA_VERSION skip the per-table existence checks
             async with self.engine.begin() as conn:
-                await conn.run_sync(Base.metadata.create_all)
+                is_sqlite = conn.dialect.name == 'sqlite'
+                current = is_sqlite and (
+                    await conn.exec_driver_sql("PRAGMA user_version")
+                ).scalar() >= SCHEMA_VERSION
+                
+                if not current:
+                    await conn.run_sync(Base.metadata.create_all)
+                    await conn.run_sync(_create_missing_indexes)
+                    if is_sqlite:
+                        await conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
             
-            self.logger.info(f"{Fore.GREEN}✅ Database initialized successfully!")
+            self.logger.info("✅ Database initialized successfully!")
             
             # Insert default fraud keywords
             await self.insert_default_keywords()
             
             return True
         except Exception as e:
-            self.logger.error(f"{Fore.RED}❌ Error initializing database: {e}")
+            self.logger.error("❌ Error initializing database: %s", e)
             return False
     
     async def insert_default_keywords(self):
@@ -74,113 +210,122 @@ class DatabaseManager:
         
         async with self.async_session() as session:
             try:
-                # Check if keywords already exist
-                result = await session.execute(select(FraudKeyword))
-                existing_keywords = result.scalars().all()
+                # One multi-row INSERT; keywords already present are left untouched
+                result = await session.execute(
+                    sqlite_insert(FraudKeyword)
+                    .values([
+                        {'keyword': keyword, 'category': category, 'weight': weight}
+                        for keyword, category, weight in default_keywords
+                    ])
+                    .on_conflict_do_nothing(index_elements=['keyword'])
+                )
+                await session.commit()
                 
-                if not existing_keywords:
-                    for keyword, category, weight in default_keywords:
-                        fraud_keyword = FraudKeyword(
-                            keyword=keyword,
-                            category=category,
-                            weight=weight
-                        )
-                        session.add(fraud_keyword)
-                    
-                    await session.commit()
-                    self.logger.info(f"{Fore.CYAN}📝 Inserted {len(default_keywords)} default fraud keywords")
+                if result.rowcount:
+                    self.invalidate_fraud_keywords()
+                    self.logger.info("📝 Inserted %s default fraud keywords", result.rowcount)
                 
             except Exception as e:
                 await session.rollback()
-                self.logger.error(f"{Fore.RED}❌ Error inserting default keywords: {e}")
+                self.logger.error("❌ Error inserting default keywords: %s", e)
     
     async def get_or_create_group(self, group_id: str, group_name: str, group_username: str = None) -> TelegramGroup:
-        """Get existing group or create new one"""
+        """Get existing group or create new one (a single upsert statement)"""
         async with self.async_session() as session:
             try:
-                # Try to find existing group
-                result = await session.execute(
-                    select(TelegramGroup).where(TelegramGroup.group_id == group_id)
-                )
-                group = result.scalar_one_or_none()
-                
-                if not group:
-                    # Create new group
-                    group = TelegramGroup(
-                        group_id=group_id,
-                        group_name=group_name,
-                        group_username=group_username
-                    )
-                    session.add(group)
-                    await session.commit()
-                    await session.refresh(group)
-                    self.logger.info(f"{Fore.CYAN}📁 Created new group: {group_name}")
-                
+                group = (await session.scalars(_GROUP_UPSERT_ROW, {
+                    'group_id': group_id, 'group_name': group_name, 'group_username': group_username
+                })).one()
+                await session.commit()
+                self._cache_pk(self._group_pks, group_id, group.id)
                 return group
                 
             except Exception as e:
                 await session.rollback()
-                self.logger.error(f"{Fore.RED}❌ Error with group: {e}")
+                self.logger.error("❌ Error with group: %s", e)
                 raise
     
     async def get_or_create_user(self, user_id: str, username: str = None, 
                                 first_name: str = None, last_name: str = None, 
                                 phone_number: str = None, is_bot: bool = False) -> User:
-        """Get existing user or create new one"""
+        """Get existing user or create new one (a single upsert statement)"""
         async with self.async_session() as session:
             try:
-                # Try to find existing user
-                result = await session.execute(
-                    select(User).where(User.user_id == user_id)
-                )
-                user = result.scalar_one_or_none()
-                
-                if not user:
-                    # Create new user
-                    user = User(
-                        user_id=user_id,
-                        username=username,
-                        first_name=first_name,
-                        last_name=last_name,
-                        phone_number=phone_number,
-                        is_bot=is_bot
-                    )
-                    session.add(user)
-                    await session.commit()
-                    await session.refresh(user)
-                    self.logger.debug(f"{Fore.CYAN}👤 Created new user: {first_name}")
-                
+                user = (await session.scalars(_USER_UPSERT_ROW, {
+                    'user_id': user_id, 'username': username, 'first_name': first_name,
+                    'last_name': last_name, 'phone_number': phone_number, 'is_bot': is_bot
+                })).one()
+                await session.commit()
+                self._cache_pk(self._user_pks, user_id, user.id)
                 return user
                 
             except Exception as e:
                 await session.rollback()
-                self.logger.error(f"{Fore.RED}❌ Error with user: {e}")
+                self.logger.error("❌ Error with user: %s", e)
                 raise
     
+    async def _upsert_group_id(self, session: AsyncSession, group_id: str, group_name: str,
+                               group_username: str = None) -> int:
+        """Insert the group unless it exists and return its primary key, in one statement"""
+        return (await session.execute(_GROUP_UPSERT_ID, {
+            'group_id': group_id, 'group_name': group_name, 'group_username': group_username
+        })).scalar_one()
+    
+    async def _upsert_user_id(self, session: AsyncSession, user_id: str, username: str = None,
+                              first_name: str = None, last_name: str = None,
+                              phone_number: str = None, is_bot: bool = False) -> int:
+        """Insert the user unless it exists and return its primary key, in one statement"""
+        return (await session.execute(_USER_UPSERT_ID, {
+            'user_id': user_id, 'username': username, 'first_name': first_name,
+            'last_name': last_name, 'phone_number': phone_number, 'is_bot': is_bot
+        })).scalar_one()
+    
+    @staticmethod
+    def _cached_pk(cache: "OrderedDict[str, int]", key: str) -> Optional[int]:
+        """Primary key cached for a Telegram id, marking it recently used"""
+        pk = cache.get(key)
+        if pk is not None:
+            cache.move_to_end(key)
+        return pk
+    
+    @staticmethod
+    def _cache_pk(cache: "OrderedDict[str, int]", key: str, pk: int):
+        """Remember a committed primary key, evicting the least recently used one when full"""
+        cache[key] = pk
+        cache.move_to_end(key)
+        if len(cache) > PK_CACHE_SIZE:
+            cache.popitem(last=False)
+    
     async def save_message(self, message_data: Dict[str, Any]) -> Message:
-        """Save a message to the database"""
+        """Save a message (and its group and sender, if new) in a single transaction"""
         async with self.async_session() as session:
             try:
-                # Get or create group and user
-                group = await self.get_or_create_group(
-                    message_data['group_id'],
-                    message_data['group_name'],
-                    message_data.get('group_username')
-                )
+                # Resolve group and user ids (cached, else upserted in this transaction)
+                group_pk = self._cached_pk(self._group_pks, message_data['group_id'])
+                if group_pk is None:
+                    group_pk = await self._upsert_group_id(
+                        session,
+                        message_data['group_id'],
+                        message_data['group_name'],
+                        message_data.get('group_username')
+                    )
                 
-                user = await self.get_or_create_user(
-                    message_data['sender_id'],
-                    message_data.get('sender_username'),
-                    message_data.get('sender_first_name'),
-                    message_data.get('sender_last_name'),
-                    is_bot=message_data.get('is_bot', False)
-                )
+                user_pk = self._cached_pk(self._user_pks, message_data['sender_id'])
+                if user_pk is None:
+                    user_pk = await self._upsert_user_id(
+                        session,
+                        message_data['sender_id'],
+                        message_data.get('sender_username'),
+                        message_data.get('sender_first_name'),
+                        message_data.get('sender_last_name'),
+                        is_bot=message_data.get('is_bot', False)
+                    )
                 
                 # Create message
                 message = Message(
                     message_id=message_data['message_id'],
-                    group_id=group.id,
-                    sender_id=user.id,
+                    group_id=group_pk,
+                    sender_id=user_pk,
                     text_content=message_data.get('text_content'),
                     message_type=message_data.get('message_type', 'text'),
                     sent_at=message_data['sent_at'],
@@ -190,72 +335,240 @@ class DatabaseManager:
                 
                 session.add(message)
                 await session.commit()
-                await session.refresh(message)
                 
-                self.logger.debug(f"{Fore.GREEN}💾 Saved message to database")
+                # Only committed rows may be cached
+                self._cache_pk(self._group_pks, message_data['group_id'], group_pk)
+                self._cache_pk(self._user_pks, message_data['sender_id'], user_pk)
+                
+                self.logger.debug("💾 Saved message to database")
                 return message
                 
             except Exception as e:
                 await session.rollback()
-                self.logger.error(f"{Fore.RED}❌ Error saving message: {e}")
+                self.logger.error("❌ Error saving message: %s", e)
+                raise
+    
+    async def save_messages(self, message_dicts: List[Dict[str, Any]]) -> List[Message]:
+        """
+        Save a batch of messages in one transaction.
+        
+        New groups and senders are inserted with one statement each, their ids
+        read back with one SELECT each, and all messages are inserted with a
+        single executemany.
+        
+        Args:
+            message_dicts: Message data in the same format as save_message
+            
+        Returns:
+            List[Message]: Saved messages, in input order
+        """
+        if not message_dicts:
+            return []
+        
+        # Groups and senders without a cached primary key; the first occurrence
+        # of each wins, as with save_message
+        group_pks: Dict[str, int] = {}
+        user_pks: Dict[str, int] = {}
+        group_rows: Dict[str, Dict[str, Any]] = {}
+        user_rows: Dict[str, Dict[str, Any]] = {}
+        for data in message_dicts:
+            group_id, user_id = data['group_id'], data['sender_id']
+            if group_id not in group_pks and group_id not in group_rows:
+                cached = self._cached_pk(self._group_pks, group_id)
+                if cached is not None:
+                    group_pks[group_id] = cached
+                else:
+                    group_rows[group_id] = {
+                        'group_id': group_id,
+                        'group_name': data['group_name'],
+                        'group_username': data.get('group_username')
+                    }
+            if user_id not in user_pks and user_id not in user_rows:
+                cached = self._cached_pk(self._user_pks, user_id)
+                if cached is not None:
+                    user_pks[user_id] = cached
+                else:
+                    user_rows[user_id] = {
+                        'user_id': user_id,
+                        'username': data.get('sender_username'),
+                        'first_name': data.get('sender_first_name'),
+                        'last_name': data.get('sender_last_name'),
+                        'phone_number': None,
+                        'is_bot': data.get('is_bot', False)
+                    }
+        
+        async with self.async_session() as session:
+            try:
+                # Insert unknown groups and senders, then map their Telegram ids to primary keys
+                if group_rows:
+                    await session.execute(
+                        sqlite_insert(TelegramGroup).on_conflict_do_nothing(index_elements=['group_id']),
+                        list(group_rows.values())
+                    )
+                    group_pks.update((await session.execute(
+                        select(TelegramGroup.group_id, TelegramGroup.id)
+                        .where(TelegramGroup.group_id.in_(group_rows))
+                    )).all())
+                if user_rows:
+                    await session.execute(
+                        sqlite_insert(User).on_conflict_do_nothing(index_elements=['user_id']),
+                        list(user_rows.values())
+                    )
+                    user_pks.update((await session.execute(
+                        select(User.user_id, User.id).where(User.user_id.in_(user_rows))
+                    )).all())
+                
+                result = await session.scalars(
+                    insert(Message).returning(Message, sort_by_parameter_order=True),
+                    [
+                        {
+                            'message_id': data['message_id'],
+                            'group_id': group_pks[data['group_id']],
+                            'sender_id': user_pks[data['sender_id']],
+                            'text_content': data.get('text_content'),
+                            'message_type': data.get('message_type', 'text'),
+                            'sent_at': data['sent_at'],
+                            'has_media': data.get('has_media', False),
+                            'media_type': data.get('media_type')
+                        }
+                        for data in message_dicts
+                    ]
+                )
+                messages = result.all()
+                await session.commit()
+                
+                for group_id, pk in group_pks.items():
+                    self._cache_pk(self._group_pks, group_id, pk)
+                for user_id, pk in user_pks.items():
+                    self._cache_pk(self._user_pks, user_id, pk)
+                
+                self.logger.debug("💾 Saved %s messages to database", len(messages))
+                return messages
+                
+            except Exception as e:
+                await session.rollback()
+                self.logger.error("❌ Error saving messages: %s", e)
                 raise
     
     async def save_fraud_detection(self, message_id: int, detection_data: Dict[str, Any]) -> FraudDetection:
         """Save fraud detection results"""
         async with self.async_session() as session:
             try:
-                fraud_detection = FraudDetection(
-                    message_id=message_id,
-                    is_suspicious=detection_data['is_suspicious'],
-                    fraud_score=detection_data['fraud_score'],
-                    detected_keywords=json.dumps(detection_data.get('detected_keywords', [])),
-                    detection_method=detection_data['detection_method'],
-                    alert_sent=detection_data.get('alert_sent', False)
-                )
+                fraud_detection = FraudDetection(**self._fraud_detection_row(message_id, detection_data))
                 
                 session.add(fraud_detection)
                 await session.commit()
-                await session.refresh(fraud_detection)
                 
                 return fraud_detection
                 
             except Exception as e:
                 await session.rollback()
-                self.logger.error(f"{Fore.RED}❌ Error saving fraud detection: {e}")
+                self.logger.error("❌ Error saving fraud detection: %s", e)
                 raise
     
+    @staticmethod
+    def _fraud_detection_row(message_id: int, detection_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Column values of a FraudDetection row"""
+        return {
+            'message_id': message_id,
+            'is_suspicious': detection_data['is_suspicious'],
+            'fraud_score': detection_data['fraud_score'],
+            'detected_keywords': detection_data.get('detected_keywords', []),
+            'detection_method': detection_data['detection_method'],
+            'alert_sent': detection_data.get('alert_sent', False)
+        }
+    
+    async def queue_fraud_detection(self, message_id: int, detection_data: Dict[str, Any]):
+        """
+        Queue fraud detection results for a batched insert.
+        
+        Unlike save_fraud_detection this does not wait for the write: rows are
+        flushed in batches of up to FRAUD_BATCH_SIZE, one commit per batch.
+        Call close() to flush what is still queued.
+        """
+        if self._fraud_queue is None:
+            self._fraud_queue = asyncio.Queue()
+        if self._fraud_flusher is None or self._fraud_flusher.done():
+            self._fraud_flusher = asyncio.create_task(self._flush_fraud_loop())
+        
+        await self._fraud_queue.put(self._fraud_detection_row(message_id, detection_data))
+    
+    async def _flush_fraud_loop(self):
+        """Drain the fraud queue, inserting each collected batch with one statement"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            rows = [await self._fraud_queue.get()]
+            deadline = loop.time() + FRAUD_FLUSH_INTERVAL
+            
+            # Collect more rows until the batch is full or the interval has passed
+            while len(rows) < FRAUD_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    rows.append(await asyncio.wait_for(self._fraud_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await self._insert_fraud_rows(rows)
+            except Exception as e:
+                # One bad row must not cost the rest of the batch: retry each on its own
+                self.logger.warning("Batch of %s fraud detections failed, retrying row by row: %s", len(rows), e)
+                for row in rows:
+                    try:
+                        await self._insert_fraud_rows([row])
+                    except Exception as row_error:
+                        self.logger.error("❌ Error saving queued fraud detection for message %s: %s",
+                                          row.get('message_id'), row_error)
+            finally:
+                for _ in rows:
+                    self._fraud_queue.task_done()
+    
+    async def _insert_fraud_rows(self, rows: List[Dict[str, Any]]):
+        """Insert fraud detection rows with one statement in one transaction"""
+        async with self.async_session() as session:
+            await session.execute(insert(FraudDetection), rows)
+            await session.commit()
+    
     async def get_fraud_keywords(self) -> List[FraudKeyword]:
-        """Get all active fraud keywords"""
+        """Get all active fraud keywords (queried once, then served from memory)"""
+        if self._keyword_cache is not None:
+            return list(self._keyword_cache)
+        
         async with self.async_session() as session:
             try:
-                result = await session.execute(
-                    select(FraudKeyword).where(FraudKeyword.is_active == True)
-                )
-                return result.scalars().all()
+                result = await session.execute(_ACTIVE_KEYWORDS)
+                self._keyword_cache = tuple(result.scalars().all())
+                return list(self._keyword_cache)
                 
             except Exception as e:
-                self.logger.error(f"{Fore.RED}❌ Error getting fraud keywords: {e}")
+                self.logger.error("❌ Error getting fraud keywords: %s", e)
                 return []
     
+    def invalidate_fraud_keywords(self):
+        """Drop the cached keywords; call after changing the fraud_keywords table"""
+        self._keyword_cache = None
+    
     async def create_monitoring_session(self, session_name: str, target_groups: List[str]) -> MonitoringSession:
         """Create a new monitoring session"""
         async with self.async_session() as session:
             try:
                 monitoring_session = MonitoringSession(
                     session_name=session_name,
-                    target_groups=json.dumps(target_groups)
+                    target_groups=target_groups
                 )
                 
                 session.add(monitoring_session)
                 await session.commit()
-                await session.refresh(monitoring_session)
                 
-                self.logger.info(f"{Fore.CYAN}🎯 Created monitoring session: {session_name}")
+                self.logger.info("🎯 Created monitoring session: %s", session_name)
                 return monitoring_session
                 
             except Exception as e:
                 await session.rollback()
-                self.logger.error(f"{Fore.RED}❌ Error creating monitoring session: {e}")
+                self.logger.error("❌ Error creating monitoring session: %s", e)
                 raise
     
     async def update_session_stats(self, session_id: int, messages_count: int = 0, 
@@ -285,29 +598,112 @@ class DatabaseManager:
                 
             except Exception as e:
                 await session.rollback()
-                self.logger.error(f"{Fore.RED}❌ Error updating session stats: {e}")
+                self.logger.error("❌ Error updating session stats: %s", e)
+    
+    def add_session_stats(self, session_id: int, messages_count: int = 0,
+                          images_count: int = 0, fraud_alerts: int = 0):
+        """
+        Add to a monitoring session's counters without writing immediately.
+        
+        Deltas are summed in memory and written by a background task, one
+        UPDATE per session every SESSION_STATS_FLUSH_INTERVAL seconds, instead
+        of one commit per processed message. Must be called from the event loop.
+        """
+        pending = self._pending_stats.setdefault(session_id, [0, 0, 0])
+        pending[0] += messages_count
+        pending[1] += images_count
+        pending[2] += fraud_alerts
+        
+        if self._stats_flusher is None or self._stats_flusher.done():
+            self._stats_stop.clear()
+            self._stats_flusher = asyncio.create_task(self._flush_stats_loop())
+    
+    async def _flush_stats_loop(self):
+        """Write accumulated session counters periodically until none are pending or close() stops it"""
+        while self._pending_stats and not self._stats_stop.is_set():
+            try:
+                await asyncio.wait_for(self._stats_stop.wait(), SESSION_STATS_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush_session_stats()
+    
+    async def flush_session_stats(self):
+        """Write all counter deltas accumulated by add_session_stats"""
+        pending, self._pending_stats = self._pending_stats, {}
+        for session_id, (messages_count, images_count, fraud_alerts) in pending.items():
+            await self.update_session_stats(session_id, messages_count, images_count, fraud_alerts)
     
-    async def get_recent_messages(self, limit: int = 50) -> List[Message]:
-        """Get recent messages with related data"""
+    @staticmethod
+    def _recent_messages_query(limit: int, before: Optional[Tuple[datetime, int]]):
+        """Newest-first message statement and parameters, optionally after a keyset cursor"""
+        if before is None:
+            return _RECENT_MESSAGES, {'limit': limit}
+        return _RECENT_MESSAGES_BEFORE, {'limit': limit, 'before_at': before[0], 'before_id': before[1]}
+    
+    async def get_recent_messages(self, limit: int = 50,
+                                  before: Optional[Tuple[datetime, int]] = None) -> List[Message]:
+        """
+        Get recent messages with related data
+        
+        Args:
+            limit: Maximum number of messages to return
+            before: Optional (processed_at, id) of the last message of the previous page
+        """
         async with self.async_session() as session:
             try:
-                result = await session.execute(
-                    select(Message)
-                    .options(selectinload(Message.group), selectinload(Message.sender))
-                    .order_by(Message.processed_at.desc())
-                    .limit(limit)
-                )
+                result = await session.execute(*self._recent_messages_query(limit, before))
                 return result.scalars().all()
                 
             except Exception as e:
-                self.logger.error(f"{Fore.RED}❌ Error getting recent messages: {e}")
+                self.logger.error("❌ Error getting recent messages: %s", e)
                 return []
     
+    async def iter_messages(self, before: Optional[Tuple[datetime, int]] = None,
+                            batch_size: int = 500) -> AsyncIterator[Message]:
+        """
+        Stream messages newest first without materializing them all.
+        
+        Each page of batch_size rows is fetched with a keyset query and its
+        rows are yielded as the cursor produces them.
+        
+        Args:
+            before: Optional (processed_at, id) cursor to start after
+            batch_size: Rows per query
+        """
+        while True:
+            count = 0
+            try:
+                async with self.async_session() as session:
+                    result = await session.stream_scalars(*self._recent_messages_query(batch_size, before))
+                    async for message in result:
+                        count += 1
+                        before = (message.processed_at, message.id)
+                        yield message
+            except Exception as e:
+                self.logger.error("❌ Error streaming messages: %s", e)
+                return
+            
+            if count < batch_size:
+                return
+    
     async def close(self):
-        """Close database connections"""
+        """Flush queued fraud detections and session counters, then close database connections"""
+        if self._stats_flusher is not None:
+            # Let an in-flight flush finish: its deltas are no longer pending
+            self._stats_stop.set()
+            await asyncio.gather(self._stats_flusher, return_exceptions=True)
+            self._stats_flusher = None
+        await self.flush_session_stats()
+        
+        if self._fraud_flusher is not None:
+            await self._fraud_queue.join()
+            self._fraud_flusher.cancel()
+            await asyncio.gather(self._fraud_flusher, return_exceptions=True)
+            self._fraud_flusher = None
+        
         try:
             if hasattr(self, 'engine') and self.engine:
                 await self.engine.dispose()
-                self.logger.info(f"{Fore.YELLOW}🔌 Database connections closed")
+                self.logger.info("🔌 Database connections closed")
         except Exception as e:
-            self.logger.error(f"{Fore.RED}❌ Error closing database: {e}")
\ No newline at end of file
+            self.logger.error("❌ Error closing database: %s", e)
\ No newline at end of file
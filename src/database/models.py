@@ -1,10 +1,21 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from datetime import datetime
+from sqlalchemy.sql import func
 
 Base = declarative_base()
 
+# Timestamp defaults are rendered into the INSERT/UPDATE and stamped by SQLite in
+# UTC (like datetime.utcnow) instead of bound from Python per row.
+#
+# SQLite's %f yields seconds with only three fractional digits ("SS.SSS"), so the
+# literal "000" pads the text to six digits: '2026-01-01 12:00:00.123000'. The
+# stored values are therefore millisecond precision but written in SQLAlchemy's
+# own DateTime text format. Stored timestamps are compared with bound datetime
+# parameters as strings, so this padding is what makes ordering and range
+# queries on these columns correct; do not drop it.
+UTC_NOW = func.strftime('%Y-%m-%d %H:%M:%f000', 'now')
+
 class TelegramGroup(Base):
     """Model for storing Telegram group information"""
     __tablename__ = 'telegram_groups'
@@ -13,7 +24,7 @@ class TelegramGroup(Base):
     group_id = Column(String(50), unique=True, nullable=False)  # Telegram group ID
     group_name = Column(String(255), nullable=False)
     group_username = Column(String(255), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
     
     # Relationships
     messages = relationship("Message", back_populates="group")
@@ -29,7 +40,7 @@ class User(Base):
     last_name = Column(String(255), nullable=True)
     phone_number = Column(String(20), nullable=True)
     is_bot = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
     
     # Relationships
     messages = relationship("Message", back_populates="sender")
@@ -40,8 +51,8 @@ class Message(Base):
     
     id = Column(Integer, primary_key=True)
     message_id = Column(String(50), nullable=False)  # Telegram message ID
-    group_id = Column(Integer, ForeignKey('telegram_groups.id'), nullable=False)
-    sender_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    group_id = Column(Integer, ForeignKey('telegram_groups.id'), nullable=False, index=True)
+    sender_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
     
     # Message content
     text_content = Column(Text, nullable=True)
@@ -49,7 +60,7 @@ class Message(Base):
     
     # Timestamps
     sent_at = Column(DateTime, nullable=False)  # When message was sent on Telegram
-    processed_at = Column(DateTime, default=datetime.utcnow)  # When we processed it
+    processed_at = Column(DateTime, default=UTC_NOW, index=True)  # When we processed it
     
     # Media information
     has_media = Column(Boolean, default=False)
@@ -58,15 +69,16 @@ class Message(Base):
     # Relationships
     group = relationship("TelegramGroup", back_populates="messages")
     sender = relationship("User", back_populates="messages")
-    media_files = relationship("MediaFile", back_populates="message")
-    fraud_detections = relationship("FraudDetection", back_populates="message")
+    # Collections must be eager-loaded explicitly (async sessions cannot lazy load)
+    media_files = relationship("MediaFile", back_populates="message", lazy="raise")
+    fraud_detections = relationship("FraudDetection", back_populates="message", lazy="raise")
 
 class MediaFile(Base):
     """Model for storing media file information"""
     __tablename__ = 'media_files'
     
     id = Column(Integer, primary_key=True)
-    message_id = Column(Integer, ForeignKey('messages.id'), nullable=False)
+    message_id = Column(Integer, ForeignKey('messages.id'), nullable=False, index=True)
     
     # File information
     file_id = Column(String(255), nullable=False)  # Telegram file ID
@@ -82,7 +94,7 @@ class MediaFile(Base):
     ocr_processed = Column(Boolean, default=False)
     ocr_processed_at = Column(DateTime, nullable=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
     
     # Relationships
     message = relationship("Message", back_populates="media_files")
@@ -92,19 +104,19 @@ class FraudDetection(Base):
     __tablename__ = 'fraud_detections'
     
     id = Column(Integer, primary_key=True)
-    message_id = Column(Integer, ForeignKey('messages.id'), nullable=False)
+    message_id = Column(Integer, ForeignKey('messages.id'), nullable=False, index=True)
     
     # Detection results
     is_suspicious = Column(Boolean, default=False)
     fraud_score = Column(Float, default=0.0)  # 0.0 to 1.0
-    detected_keywords = Column(Text, nullable=True)  # JSON string of detected keywords
+    detected_keywords = Column(JSON, nullable=True)  # List of detected keywords
     detection_method = Column(String(100), nullable=False)  # keyword, ocr, ml, etc.
     
     # Alert information
     alert_sent = Column(Boolean, default=False)
     alert_sent_at = Column(DateTime, nullable=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
     
     # Relationships
     message = relationship("Message", back_populates="fraud_detections")
@@ -112,13 +124,17 @@ class FraudDetection(Base):
 class FraudKeyword(Base):
     """Model for storing fraud keywords and patterns"""
     __tablename__ = 'fraud_keywords'
+    __table_args__ = (
+        # get_fraud_keywords filters on is_active
+        Index('ix_fraud_active_category', 'is_active', 'category'),
+    )
     
     id = Column(Integer, primary_key=True)
     keyword = Column(String(255), nullable=False, unique=True)
     category = Column(String(100), nullable=False)  # scam, investment, crypto, etc.
     weight = Column(Float, default=1.0)  # Weight for scoring
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
 
 class MonitoringSession(Base):
     """Model for tracking monitoring sessions"""
@@ -126,7 +142,7 @@ class MonitoringSession(Base):
     
     id = Column(Integer, primary_key=True)
     session_name = Column(String(255), nullable=False)
-    started_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, default=UTC_NOW)
     ended_at = Column(DateTime, nullable=True)
     
     # Statistics
@@ -135,5 +151,5 @@ class MonitoringSession(Base):
     fraud_alerts = Column(Integer, default=0)
     
     # Configuration
-    target_groups = Column(Text, nullable=True)  # JSON string of monitored groups
+    target_groups = Column(JSON, nullable=True)  # List of monitored groups
     is_active = Column(Boolean, default=True)
\ No newline at end of file
@@ -4,50 +4,251 @@ Manages the simplified 4-table structure with configurable message saving
 """
 
 import os
+import time
+import queue
+import atexit
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
-from sqlalchemy import create_engine, and_, or_, desc
-from sqlalchemy.orm import sessionmaker, Session
+from typing import Any, List, Dict, Iterator, NamedTuple, Optional, Sequence, Tuple, Union
+from sqlalchemy import create_engine, event, insert, select, update, delete, func, case, bindparam, and_, or_, desc
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import scoped_session, sessionmaker, Session
+from sqlalchemy.pool import QueuePool, StaticPool
 from sqlalchemy.exc import SQLAlchemyError
 
-from .simplified_models import Base, Message, FraudDetection, FraudKeyword, MonitoringSession, MessageSavingConfig
+from .simplified_models import Base, Message, FraudDetection, FraudKeyword, MonitoringSession, MessageSavingConfig, UTC_NOW
 
 logger = logging.getLogger(__name__)
 
+# Compiled-statement cache entries per engine (SQLAlchemy's default is 500);
+# every statement here has a fixed shape with values bound as parameters
+QUERY_CACHE_SIZE = 1200
+
+# Warm connections kept by the engine; a local SQLite file never drops a
+# connection, so there is no pre-ping and no recycling
+DB_POOL_SIZE = 8
+DB_MAX_OVERFLOW = 16
+
+# Per-connection SQLite tuning: WAL journal with NORMAL sync (one append per
+# commit, readers don't block the writer), in-memory temp tables, a 64 MB page
+# cache, 256 MB of memory-mapped I/O and a 5 s wait on a locked database
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Deferred writes (save_message / update_session_stats with defer=True) go
+# through a bounded queue to a writer thread, which commits up to
+# MESSAGE_BATCH_SIZE of them per transaction after waiting at most
+# WRITE_BATCH_WAIT seconds for more to arrive
+MESSAGE_BATCH_SIZE = 500
+WRITE_QUEUE_SIZE = 10000
+WRITE_BATCH_WAIT = 0.05
+
+# Multi-row INSERTs returning the new ids in the order the rows were given
+_INSERT_MESSAGES = insert(Message).returning(Message.id, sort_by_parameter_order=True)
+_INSERT_FRAUD_DETECTIONS = insert(FraudDetection)
+
+# Indexes that earlier versions created and the models no longer declare
+_SUPERSEDED_INDEXES = ('ix_msg_susp_proc',)
+
+# Read paths select whole table rows and return them as plain dicts (column
+# name -> value), skipping ORM object construction and attribute instrumentation
+_MESSAGES = Message.__table__
+_FRAUD_DETECTIONS = FraudDetection.__table__
+_SUSPICIOUS_MESSAGES = (
+    select(_MESSAGES)
+    .where(_MESSAGES.c.is_suspicious == True)
+    .order_by(desc(_MESSAGES.c.processed_at))
+    .limit(bindparam('limit'))
+)
+_MESSAGE_BY_ID = select(_MESSAGES).where(_MESSAGES.c.id == bindparam('message_id'))
+_FRAUD_DETECTIONS_FOR = (
+    select(_FRAUD_DETECTIONS)
+    .where(_FRAUD_DETECTIONS.c.message_id.in_(bindparam('message_ids', expanding=True)))
+    .order_by(_FRAUD_DETECTIONS.c.id)
+)
+
+# Session counters are incremented in SQL, one atomic UPDATE per call, so
+# concurrent writers never lose each other's increments
+_MONITORING_SESSIONS = MonitoringSession.__table__
+_ADD_SESSION_STATS = (
+    update(_MONITORING_SESSIONS)
+    .where(_MONITORING_SESSIONS.c.id == bindparam('session_id'))
+    .values(
+        messages_processed=_MONITORING_SESSIONS.c.messages_processed + bindparam('add_messages'),
+        suspicious_messages=_MONITORING_SESSIONS.c.suspicious_messages + bindparam('add_suspicious'),
+        fraud_alerts=_MONITORING_SESSIONS.c.fraud_alerts + bindparam('add_alerts'),
+    )
+)
+_END_SESSION = (
+    update(_MONITORING_SESSIONS)
+    .where(_MONITORING_SESSIONS.c.id == bindparam('session_id'))
+    .values(ended_at=UTC_NOW, is_active=False)
+    .returning(_MONITORING_SESSIONS.c.session_name)
+)
+
+# A duplicate keyword is a no-op (rowcount 0), not an IntegrityError and rollback
+_INSERT_KEYWORD = sqlite_insert(FraudKeyword.__table__).values(
+    keyword=bindparam('keyword'),
+    category=bindparam('category'),
+    fraud_score=bindparam('fraud_score'),
+    description=bindparam('description'),
+).on_conflict_do_nothing(index_elements=['keyword'])
+_DELETE_KEYWORD = delete(FraudKeyword.__table__).where(FraudKeyword.keyword == bindparam('keyword'))
+
+# cleanup_old_messages deletes and commits at most this many rows at a time,
+# which keeps each write transaction (and the WAL file) bounded
+CLEANUP_CHUNK_SIZE = 10000
+
+# One chunk of old non-suspicious messages
+_DELETE_EXPIRED_CHUNK = delete(_MESSAGES).where(
+    _MESSAGES.c.id.in_(
+        select(_MESSAGES.c.id).where(
+            and_(
+                _MESSAGES.c.processed_at < bindparam('cutoff'),
+                _MESSAGES.c.is_suspicious == False
+            )
+        ).limit(bindparam('chunk_size')).scalar_subquery()
+    )
+)
+
+# get_database_stats results are reused for this many seconds
+STATS_CACHE_TTL = 10.0
+
+def _count(model, *criteria):
+    """Scalar subquery counting the rows of `model` matching `criteria`"""
+    return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+# Every statistic in one statement: messages are scanned once with
+# conditional aggregation, the other tables are counted as scalar subqueries
+_DATABASE_STATS = select(
+    func.count().label('total_messages'),
+    func.coalesce(func.sum(case((Message.is_suspicious == True, 1), else_=0)), 0).label('suspicious_messages'),
+    _count(FraudDetection).label('fraud_detections'),
+    _count(FraudKeyword, FraudKeyword.is_active == True).label('active_keywords'),
+    _count(MonitoringSession, MonitoringSession.is_active == True).label('active_sessions'),
+).select_from(Message)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS to every new DBAPI connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+def _engine_options(database_path: str) -> Dict[str, Any]:
+    """Pool arguments for create_engine: one shared connection for in-memory SQLite, a sized QueuePool for files"""
+    if database_path in ('', ':memory:'):
+        # Every new connection to :memory: is a separate, empty database, so the
+        # caller's threads and the writer thread must all share one connection
+        return {'poolclass': StaticPool}
+    
+    # Pooled file connections keep their PRAGMAs and page cache between sessions
+    return {
+        'poolclass': QueuePool,
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_pre_ping': False,
+        'pool_recycle': -1,
+    }
+
+class _StatsDelta(NamedTuple):
+    """Deferred increment of a monitoring session's counters"""
+    session_id: int
+    messages_processed: int
+    suspicious_messages: int
+    fraud_alerts: int
+
+# A queued write: a (message_data, fraud_result) pair or a counter increment
+_WriteItem = Union[Tuple[Dict, Optional[Dict]], _StatsDelta]
+
 class SimplifiedDatabaseManager:
     """Simplified database manager with clean architecture principles"""
     
-    def __init__(self, database_path: str = None):
+    def __init__(self, database_path: str = None, flush_size: int = MESSAGE_BATCH_SIZE):
         """Initialize database manager"""
         self.database_path = database_path or os.getenv('DATABASE_PATH', 'fraud_monitor.db')
-        self.engine = create_engine(f'sqlite:///{self.database_path}', echo=False)
+        self.engine = create_engine(
+            f'sqlite:///{self.database_path}',
+            echo=False,
+            query_cache_size=QUERY_CACHE_SIZE,
+            connect_args={'check_same_thread': False},
+            **_engine_options(self.database_path),
+        )
+        event.listen(self.engine, "connect", _set_sqlite_pragmas)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        # One long-lived session per thread for the manager's own queries
+        self.Session = scoped_session(self.SessionLocal)
         self._create_tables()
+        
+        # Deferred writes in arrival order and the writer thread that drains
+        # them (started on first use; None is its stop sentinel)
+        self.flush_size = flush_size
+        self._write_q: "queue.Queue[Optional[_WriteItem]]" = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        
+        # get_keywords results by (category, active_only), cleared whenever a
+        # keyword is added or removed; the lock covers loads and invalidation
+        self._kw_cache: Dict[Tuple[Optional[str], bool], List[Dict]] = {}
+        self._kw_lock = threading.Lock()
+        
+        # (monotonic timestamp, stats) of the last get_database_stats query
+        self._stats_cache: Optional[Tuple[float, Dict]] = None
     
     def _create_tables(self):
         """Create all tables if they don't exist"""
         try:
-            Base.metadata.create_all(bind=self.engine)
+            with self.engine.begin() as connection:
+                Base.metadata.create_all(bind=connection)
+                # create_all skips tables that already exist, along with any
+                # index added to them since; CREATE INDEX IF NOT EXISTS those
+                for table in Base.metadata.sorted_tables:
+                    for index in table.indexes:
+                        index.create(connection, checkfirst=True)
+                for name in _SUPERSEDED_INDEXES:
+                    connection.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
             logger.info("Database tables created successfully")
         except SQLAlchemyError as e:
             logger.error(f"Error creating database tables: {e}")
             raise
     
     def get_session(self) -> Session:
-        """Get a database session"""
+        """Get a new database session (owned and closed by the caller)"""
         return self.SessionLocal()
     
+    @contextmanager
+    def _transaction(self) -> Iterator[Session]:
+        """This thread's scoped session inside a transaction (commit on success, rollback on error)"""
+        session = self.Session()
+        try:
+            with session.begin():
+                yield session
+        finally:
+            session.close()
+    
     def close(self):
         """Close database connections"""
         try:
+            self._stop_writer()
+            self.Session.remove()
             self.engine.dispose()
             logger.info("Database connections closed successfully")
         except Exception as e:
             logger.error(f"Error closing database connections: {e}")
     
     # Message Management
-    def save_message(self, message_data: Dict, fraud_result: Dict = None, session_config: bool = None) -> Optional[int]:
+    def save_message(self, message_data: Dict, fraud_result: Dict = None, session_config: bool = None,
+                     defer: bool = False) -> Optional[int]:
         """
         Save a message if it meets the saving criteria
         
@@ -55,9 +256,12 @@ class SimplifiedDatabaseManager:
             message_data: Dictionary containing message information
             fraud_result: Optional fraud detection results
             session_config: Session-specific saving configuration
+            defer: Hand the message to the background writer and return at
+                once; it is committed with the next batch (flush_pending
+                waits for queued messages, close drains the queue)
             
         Returns:
-            Message ID if saved, None if not saved
+            Message ID if saved now, None if not saved or deferred
         """
         is_suspicious = fraud_result.get('is_suspicious', False) if fraud_result else False
         
@@ -66,82 +270,230 @@ class SimplifiedDatabaseManager:
             logger.debug(f"Skipping non-suspicious message {message_data.get('message_id')}")
             return None
         
-        with self.get_session() as session:
+        if defer:
+            if not self._enqueue((message_data, fraud_result)):
+                # Writer is behind: save in the caller instead of dropping the message
+                logger.warning("Write queue full, saving message synchronously")
+                self._insert_messages([(message_data, fraud_result)])
+            return None
+        
+        message_ids = self._insert_messages([(message_data, fraud_result)])
+        if message_ids:
+            logger.info(f"Saved message {message_data['message_id']} (suspicious: {is_suspicious})")
+            return message_ids[0]
+        return None
+    
+    def save_messages_bulk(self, items: List[Tuple[Dict, Optional[Dict]]],
+                           session_config: bool = None) -> List[Optional[int]]:
+        """
+        Save many messages in a single transaction
+        
+        Args:
+            items: (message_data, fraud_result) pairs, as taken by save_message
+            session_config: Session-specific saving configuration
+            
+        Returns:
+            Message ID per item, None for items not saved (all None on error)
+        """
+        saved_positions = []
+        saved_items = []
+        for position, (message_data, fraud_result) in enumerate(items):
+            is_suspicious = fraud_result.get('is_suspicious', False) if fraud_result else False
+            if MessageSavingConfig.should_save_message(is_suspicious, session_config):
+                saved_positions.append(position)
+                saved_items.append((message_data, fraud_result))
+        
+        result: List[Optional[int]] = [None] * len(items)
+        for position, message_id in zip(saved_positions, self._insert_messages(saved_items)):
+            result[position] = message_id
+        
+        if saved_items:
+            logger.info(f"Saved {len(saved_items)} of {len(items)} messages in one batch")
+        return result
+    
+    def flush_pending(self) -> None:
+        """Block until every write deferred so far has been committed"""
+        if self._writer is not None:
+            self._write_q.join()
+    
+    def _enqueue(self, item: _WriteItem) -> bool:
+        """Hand a write to the writer thread; False if the queue is full"""
+        self._start_writer()
+        try:
+            self._write_q.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+    
+    def _start_writer(self) -> None:
+        """Start the background writer thread if it is not running"""
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="db-writer", daemon=True)
+                self._writer.start()
+                # Queued messages still reach the database if close() is never called
+                atexit.register(self._stop_writer)
+    
+    def _stop_writer(self) -> None:
+        """Drain the write queue and stop the writer thread (safe to call repeatedly)"""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is None:
+            return
+        atexit.unregister(self._stop_writer)
+        self._write_q.put(None)
+        writer.join()
+    
+    def _write_loop(self) -> None:
+        """Writer thread: commit queued writes in batches until the stop sentinel"""
+        stopping = False
+        while not stopping:
+            batch = [self._write_q.get()]
+            while len(batch) < self.flush_size:
+                try:
+                    batch.append(self._write_q.get(timeout=WRITE_BATCH_WAIT))
+                except queue.Empty:
+                    break
+            
+            items = [item for item in batch if item is not None]
+            stopping = len(items) < len(batch)
             try:
-                # Create message record
-                message = Message(
-                    message_id=str(message_data['message_id']),
-                    group_id=str(message_data['group_id']),
-                    group_name=message_data.get('group_name', 'Unknown'),
-                    sender_id=str(message_data['sender_id']),
-                    sender_username=message_data.get('sender_username'),
-                    sender_first_name=message_data.get('sender_first_name'),
-                    text_content=message_data.get('text_content'),
-                    message_type=message_data.get('message_type', 'text'),
-                    has_media=message_data.get('has_media', False),
-                    media_type=message_data.get('media_type'),
-                    file_id=message_data.get('file_id'),
-                    local_path=message_data.get('local_path'),
-                    ocr_text=message_data.get('ocr_text'),
-                    ocr_processed=message_data.get('ocr_processed', False),
-                    is_suspicious=is_suspicious,
-                    fraud_score=fraud_result.get('fraud_score', 0.0) if fraud_result else 0.0,
-                    sent_at=message_data.get('sent_at', datetime.utcnow())
-                )
-                
-                session.add(message)
-                session.flush()  # Get the ID
-                
-                # Save fraud detection details if suspicious
-                if is_suspicious and fraud_result:
-                    fraud_detection = FraudDetection(
-                        message_id=message.id,
-                        fraud_score=fraud_result['fraud_score'],
-                        detected_keywords=fraud_result.get('detected_keywords', []),
-                        detection_method=fraud_result.get('detection_method', 'keyword_analysis'),
-                        risk_level=fraud_result.get('risk_level'),
-                        confidence_level=fraud_result.get('confidence_level')
-                    )
-                    session.add(fraud_detection)
-                
-                session.commit()
-                logger.info(f"Saved message {message.message_id} (suspicious: {is_suspicious})")
-                return message.id
+                if items:
+                    self._write_batch(items)
+            finally:
+                for _ in batch:
+                    self._write_q.task_done()
+    
+    def _write_batch(self, items: List[_WriteItem]) -> None:
+        """Commit a writer batch; if it fails, retry item by item so one bad write loses only itself"""
+        messages = [item for item in items if not isinstance(item, _StatsDelta)]
+        deltas = [item for item in items if isinstance(item, _StatsDelta)]
+        try:
+            self._write_messages(messages, deltas)
+            logger.debug(f"Wrote {len(messages)} deferred messages and {len(deltas)} counter updates")
+            return
+        except Exception as e:
+            if len(items) == 1:
+                logger.error(f"Error writing deferred update: {e}")
+                return
+        
+        for item in items:
+            self._write_batch([item])
+    
+    def _insert_messages(self, items: List[Tuple[Dict, Optional[Dict]]]) -> List[int]:
+        """Insert messages and their fraud detections with one multi-row INSERT each"""
+        if not items:
+            return []
+        
+        try:
+            return self._write_messages(items)
+        except SQLAlchemyError as e:
+            logger.error(f"Error saving message: {e}")
+            return []
+    
+    def _write_messages(self, items: List[Tuple[Dict, Optional[Dict]]],
+                        deltas: Sequence[_StatsDelta] = ()) -> List[int]:
+        """
+        One transaction for messages, their fraud detections and counter deltas.
+        
+        Counters are updated after the inserts of the same transaction, so they
+        never count a message that is not stored. Errors propagate and roll back.
+        """
+        message_ids: List[int] = []
+        with self.engine.begin() as connection:
+            if items:
+                message_ids = connection.execute(
+                    _INSERT_MESSAGES, [self._message_row(data, fraud) for data, fraud in items]
+                ).scalars().all()
                 
-            except SQLAlchemyError as e:
-                session.rollback()
-                logger.error(f"Error saving message: {e}")
-                return None
+                # Fraud detection details only for suspicious messages
+                fraud_rows = [
+                    self._fraud_detection_row(message_id, fraud)
+                    for message_id, (_, fraud) in zip(message_ids, items)
+                    if fraud and fraud.get('is_suspicious', False)
+                ]
+                if fraud_rows:
+                    connection.execute(_INSERT_FRAUD_DETECTIONS, fraud_rows)
+            
+            if deltas:
+                connection.execute(_ADD_SESSION_STATS, self._stats_params(deltas))
+        return message_ids
     
-    def get_suspicious_messages(self, limit: int = 100) -> List[Dict]:
-        """Get recent suspicious messages"""
-        with self.get_session() as session:
+    @staticmethod
+    def _stats_params(deltas: Sequence[_StatsDelta]) -> List[Dict]:
+        """_ADD_SESSION_STATS parameters with the deltas summed per session"""
+        totals: Dict[int, List[int]] = {}
+        for delta in deltas:
+            total = totals.setdefault(delta.session_id, [0, 0, 0])
+            total[0] += delta.messages_processed
+            total[1] += delta.suspicious_messages
+            total[2] += delta.fraud_alerts
+        
+        return [
+            {'session_id': session_id, 'add_messages': messages, 'add_suspicious': suspicious, 'add_alerts': alerts}
+            for session_id, (messages, suspicious, alerts) in totals.items()
+        ]
+    
+    @staticmethod
+    def _message_row(message_data: Dict, fraud_result: Optional[Dict]) -> Dict:
+        """Column values for one messages row"""
+        return {
+            'message_id': str(message_data['message_id']),
+            'group_id': str(message_data['group_id']),
+            'group_name': message_data.get('group_name', 'Unknown'),
+            'sender_id': str(message_data['sender_id']),
+            'sender_username': message_data.get('sender_username'),
+            'sender_first_name': message_data.get('sender_first_name'),
+            'text_content': message_data.get('text_content'),
+            'message_type': message_data.get('message_type', 'text'),
+            'has_media': message_data.get('has_media', False),
+            'media_type': message_data.get('media_type'),
+            'file_id': message_data.get('file_id'),
+            'local_path': message_data.get('local_path'),
+            'ocr_text': message_data.get('ocr_text'),
+            'ocr_processed': message_data.get('ocr_processed', False),
+            'is_suspicious': fraud_result.get('is_suspicious', False) if fraud_result else False,
+            'fraud_score': fraud_result.get('fraud_score', 0.0) if fraud_result else 0.0,
+            # Only messages without a send time pay for a Python datetime
+            'sent_at': message_data['sent_at'] if 'sent_at' in message_data else datetime.utcnow(),
+        }
+    
+    @staticmethod
+    def _fraud_detection_row(message_id: int, fraud_result: Dict) -> Dict:
+        """Column values for the fraud_detections row of a suspicious message"""
+        return {
+            'message_id': message_id,
+            'fraud_score': fraud_result['fraud_score'],
+            'detected_keywords': fraud_result.get('detected_keywords', []),
+            'detection_method': fraud_result.get('detection_method', 'keyword_analysis'),
+            'risk_level': fraud_result.get('risk_level'),
+            'confidence_level': fraud_result.get('confidence_level'),
+        }
+    
+    def get_suspicious_messages(self, limit: int = 100, include_fraud_details: bool = False) -> List[Dict]:
+        """Get recent suspicious messages, optionally with their fraud detections"""
+        with self.Session() as session:
             try:
-                messages = session.query(Message).filter(
-                    Message.is_suspicious == True
-                ).order_by(desc(Message.processed_at)).limit(limit).all()
-                
-                return [self._message_to_dict(msg) for msg in messages]
+                messages = [dict(row) for row in session.execute(_SUSPICIOUS_MESSAGES, {'limit': limit}).mappings()]
+                if include_fraud_details:
+                    self._attach_fraud_details(session, messages)
+                return messages
             except SQLAlchemyError as e:
                 logger.error(f"Error fetching suspicious messages: {e}")
                 return []
     
     def get_message_with_fraud_details(self, message_id: int) -> Optional[Dict]:
         """Get message with detailed fraud detection information"""
-        with self.get_session() as session:
+        with self.Session() as session:
             try:
-                message = session.query(Message).filter(Message.id == message_id).first()
-                if not message:
+                row = session.execute(_MESSAGE_BY_ID, {'message_id': message_id}).mappings().first()
+                if not row:
                     return None
                 
-                result = self._message_to_dict(message)
-                
-                # Add fraud detection details if available
-                fraud_detections = session.query(FraudDetection).filter(
-                    FraudDetection.message_id == message_id
-                ).all()
-                
-                result['fraud_detections'] = [self._fraud_detection_to_dict(fd) for fd in fraud_detections]
+                result = dict(row)
+                self._attach_fraud_details(session, [result])
                 return result
                 
             except SQLAlchemyError as e:
@@ -151,114 +503,123 @@ class SimplifiedDatabaseManager:
     # Keyword Management
     def add_keyword(self, keyword: str, category: str, fraud_score: float, description: str = None) -> bool:
         """Add a new fraud keyword"""
-        with self.get_session() as session:
-            try:
-                fraud_keyword = FraudKeyword(
-                    keyword=keyword.lower().strip(),
-                    category=category,
-                    fraud_score=fraud_score,
-                    description=description
-                )
-                session.add(fraud_keyword)
-                session.commit()
-                logger.info(f"Added keyword: {keyword}")
-                return True
-            except SQLAlchemyError as e:
-                session.rollback()
-                logger.error(f"Error adding keyword: {e}")
+        try:
+            with self.engine.begin() as connection:
+                added = connection.execute(_INSERT_KEYWORD, {
+                    'keyword': keyword.lower().strip(),
+                    'category': category,
+                    'fraud_score': fraud_score,
+                    'description': description,
+                }).rowcount
+            if not added:
+                logger.warning(f"Keyword already exists: {keyword}")
                 return False
+            self.invalidate_keywords()
+            logger.info(f"Added keyword: {keyword}")
+            return True
+        except SQLAlchemyError as e:
+            logger.error(f"Error adding keyword: {e}")
+            return False
     
     def get_keywords(self, category: str = None, active_only: bool = True) -> List[Dict]:
-        """Get fraud keywords, optionally filtered by category"""
-        with self.get_session() as session:
+        """Get fraud keywords, optionally filtered by category (cached until keywords change)"""
+        key = (category or None, active_only)
+        with self._kw_lock:
+            keywords = self._kw_cache.get(key)
+            if keywords is None:
+                keywords = self._load_keywords(category, active_only)
+                if keywords is None:
+                    return []
+                self._kw_cache[key] = keywords
+        
+        # Callers get their own dicts, never the cached ones
+        return [dict(kw) for kw in keywords]
+    
+    def invalidate_keywords(self) -> None:
+        """Drop cached get_keywords results (call after changing fraud_keywords directly)"""
+        with self._kw_lock:
+            self._kw_cache.clear()
+    
+    def _load_keywords(self, category: Optional[str], active_only: bool) -> Optional[List[Dict]]:
+        """Query fraud keywords, or None on a database error"""
+        with self.Session() as session:
             try:
-                query = session.query(FraudKeyword)
+                query = select(FraudKeyword.__table__)
                 
                 if active_only:
-                    query = query.filter(FraudKeyword.is_active == True)
+                    query = query.where(FraudKeyword.is_active == True)
                 
                 if category:
-                    query = query.filter(FraudKeyword.category == category)
+                    query = query.where(FraudKeyword.category == category)
                 
-                keywords = query.all()
-                return [self._keyword_to_dict(kw) for kw in keywords]
+                return [dict(row) for row in session.execute(query).mappings()]
             except SQLAlchemyError as e:
                 logger.error(f"Error fetching keywords: {e}")
-                return []
+                return None
     
     def remove_keyword(self, keyword: str) -> bool:
         """Remove a fraud keyword"""
-        with self.get_session() as session:
-            try:
-                keyword_obj = session.query(FraudKeyword).filter(
-                    FraudKeyword.keyword == keyword.lower().strip()
-                ).first()
-                
-                if keyword_obj:
-                    session.delete(keyword_obj)
-                    session.commit()
-                    logger.info(f"Removed keyword: {keyword}")
-                    return True
-                return False
-            except SQLAlchemyError as e:
-                session.rollback()
-                logger.error(f"Error removing keyword: {e}")
+        try:
+            with self.engine.begin() as connection:
+                removed = connection.execute(_DELETE_KEYWORD, {'keyword': keyword.lower().strip()}).rowcount
+            if not removed:
                 return False
+            self.invalidate_keywords()
+            logger.info(f"Removed keyword: {keyword}")
+            return True
+        except SQLAlchemyError as e:
+            logger.error(f"Error removing keyword: {e}")
+            return False
     
     # Session Management
     def start_monitoring_session(self, session_name: str, target_groups: List[str], 
                                 save_non_suspicious: bool = True) -> int:
         """Start a new monitoring session"""
-        with self.get_session() as session:
-            try:
+        try:
+            with self._transaction() as session:
                 monitoring_session = MonitoringSession(
                     session_name=session_name,
                     target_groups=target_groups,
                     save_non_suspicious=save_non_suspicious
                 )
                 session.add(monitoring_session)
-                session.commit()
-                logger.info(f"Started monitoring session: {session_name}")
-                return monitoring_session.id
-            except SQLAlchemyError as e:
-                session.rollback()
-                logger.error(f"Error starting session: {e}")
-                raise
+                session.flush()
+                session_id = monitoring_session.id
+            logger.info(f"Started monitoring session: {session_name}")
+            return session_id
+        except SQLAlchemyError as e:
+            logger.error(f"Error starting session: {e}")
+            raise
     
     def update_session_stats(self, session_id: int, messages_processed: int = 0, 
-                           suspicious_messages: int = 0, fraud_alerts: int = 0):
-        """Update session statistics"""
-        with self.get_session() as session:
-            try:
-                monitoring_session = session.query(MonitoringSession).filter(
-                    MonitoringSession.id == session_id
-                ).first()
-                
-                if monitoring_session:
-                    monitoring_session.messages_processed += messages_processed
-                    monitoring_session.suspicious_messages += suspicious_messages
-                    monitoring_session.fraud_alerts += fraud_alerts
-                    session.commit()
-            except SQLAlchemyError as e:
-                session.rollback()
-                logger.error(f"Error updating session stats: {e}")
+                           suspicious_messages: int = 0, fraud_alerts: int = 0, defer: bool = False):
+        """
+        Update session statistics
+        
+        With defer=True the increment is queued behind any deferred messages and
+        committed by the background writer in the same transaction as them.
+        """
+        delta = _StatsDelta(session_id, messages_processed, suspicious_messages, fraud_alerts)
+        if defer and self._enqueue(delta):
+            return
+        
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(_ADD_SESSION_STATS, self._stats_params([delta]))
+        except SQLAlchemyError as e:
+            logger.error(f"Error updating session stats: {e}")
     
     def end_monitoring_session(self, session_id: int):
         """End a monitoring session"""
-        with self.get_session() as session:
-            try:
-                monitoring_session = session.query(MonitoringSession).filter(
-                    MonitoringSession.id == session_id
-                ).first()
-                
-                if monitoring_session:
-                    monitoring_session.ended_at = datetime.utcnow()
-                    monitoring_session.is_active = False
-                    session.commit()
-                    logger.info(f"Ended monitoring session: {monitoring_session.session_name}")
-            except SQLAlchemyError as e:
-                session.rollback()
-                logger.error(f"Error ending session: {e}")
+        try:
+            with self.engine.begin() as connection:
+                session_name = connection.execute(
+                    _END_SESSION, {'session_id': session_id}
+                ).scalar()
+            if session_name is not None:
+                logger.info(f"Ended monitoring session: {session_name}")
+        except SQLAlchemyError as e:
+            logger.error(f"Error ending session: {e}")
     
     # Cleanup and Maintenance
     def cleanup_old_messages(self, retention_days: int = None) -> int:
@@ -266,89 +627,46 @@ class SimplifiedDatabaseManager:
         retention_days = retention_days or MessageSavingConfig.get_retention_days()
         cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
         
-        with self.get_session() as session:
-            try:
-                # Delete old non-suspicious messages
-                deleted_count = session.query(Message).filter(
-                    and_(
-                        Message.processed_at < cutoff_date,
-                        Message.is_suspicious == False
-                    )
-                ).delete()
-                
-                session.commit()
-                logger.info(f"Cleaned up {deleted_count} old messages")
-                return deleted_count
-            except SQLAlchemyError as e:
-                session.rollback()
-                logger.error(f"Error cleaning up messages: {e}")
-                return 0
+        deleted_count = 0
+        try:
+            while True:
+                # One transaction per chunk of old non-suspicious messages
+                with self.engine.begin() as connection:
+                    deleted = connection.execute(
+                        _DELETE_EXPIRED_CHUNK, {'cutoff': cutoff_date, 'chunk_size': CLEANUP_CHUNK_SIZE}
+                    ).rowcount
+                deleted_count += deleted
+                if deleted < CLEANUP_CHUNK_SIZE:
+                    break
+            
+            logger.info(f"Cleaned up {deleted_count} old messages")
+            return deleted_count
+        except SQLAlchemyError as e:
+            logger.error(f"Error cleaning up messages: {e}")
+            return deleted_count
     
     def get_database_stats(self) -> Dict:
-        """Get database statistics"""
-        with self.get_session() as session:
+        """Get database statistics (cached for STATS_CACHE_TTL seconds)"""
+        now = time.monotonic()
+        if self._stats_cache and now - self._stats_cache[0] < STATS_CACHE_TTL:
+            return dict(self._stats_cache[1])
+        
+        with self.Session() as session:
             try:
-                stats = {
-                    'total_messages': session.query(Message).count(),
-                    'suspicious_messages': session.query(Message).filter(Message.is_suspicious == True).count(),
-                    'fraud_detections': session.query(FraudDetection).count(),
-                    'active_keywords': session.query(FraudKeyword).filter(FraudKeyword.is_active == True).count(),
-                    'active_sessions': session.query(MonitoringSession).filter(MonitoringSession.is_active == True).count()
-                }
-                return stats
+                stats = dict(session.execute(_DATABASE_STATS).mappings().one())
+                self._stats_cache = (now, stats)
+                return dict(stats)
             except SQLAlchemyError as e:
                 logger.error(f"Error getting database stats: {e}")
                 return {}
     
     # Helper methods
-    def _message_to_dict(self, message: Message) -> Dict:
-        """Convert Message object to dictionary"""
-        return {
-            'id': message.id,
-            'message_id': message.message_id,
-            'group_id': message.group_id,
-            'group_name': message.group_name,
-            'sender_id': message.sender_id,
-            'sender_username': message.sender_username,
-            'sender_first_name': message.sender_first_name,
-            'text_content': message.text_content,
-            'message_type': message.message_type,
-            'has_media': message.has_media,
-            'media_type': message.media_type,
-            'file_id': message.file_id,
-            'local_path': message.local_path,
-            'ocr_text': message.ocr_text,
-            'ocr_processed': message.ocr_processed,
-            'is_suspicious': message.is_suspicious,
-            'fraud_score': message.fraud_score,
-            'sent_at': message.sent_at,
-            'processed_at': message.processed_at
-        }
-    
-    def _fraud_detection_to_dict(self, fraud_detection: FraudDetection) -> Dict:
-        """Convert FraudDetection object to dictionary"""
-        return {
-            'id': fraud_detection.id,
-            'message_id': fraud_detection.message_id,
-            'fraud_score': fraud_detection.fraud_score,
-            'detected_keywords': fraud_detection.detected_keywords,
-            'detection_method': fraud_detection.detection_method,
-            'risk_level': fraud_detection.risk_level,
-            'confidence_level': fraud_detection.confidence_level,
-            'alert_sent': fraud_detection.alert_sent,
-            'alert_sent_at': fraud_detection.alert_sent_at,
-            'created_at': fraud_detection.created_at
-        }
-    
-    def _keyword_to_dict(self, keyword: FraudKeyword) -> Dict:
-        """Convert FraudKeyword object to dictionary"""
-        return {
-            'id': keyword.id,
-            'keyword': keyword.keyword,
-            'category': keyword.category,
-            'fraud_score': keyword.fraud_score,
-            'description': keyword.description,
-            'is_active': keyword.is_active,
-            'created_at': keyword.created_at,
-            'updated_at': keyword.updated_at
-        }
\ No newline at end of file
+    @staticmethod
+    def _attach_fraud_details(session: Session, messages: List[Dict]) -> None:
+        """Add each message's fraud detections under 'fraud_detections' (one IN query for all)"""
+        by_message = {message['id']: [] for message in messages}
+        for row in session.execute(_FRAUD_DETECTIONS_FOR, {'message_ids': list(by_message)}).mappings():
+            by_message[row['message_id']].append(dict(row))
+        
+        for message in messages:
+            message['fraud_detections'] = by_message[message['id']]
@@ -3,12 +3,15 @@ Simplified Database Models - Clean Code Architecture
 Only 4 tables instead of 7, with configurable message saving
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from datetime import datetime
+from functools import lru_cache
 import os
 
+# Shared SQL timestamp default: stamped by SQLite inside the INSERT/UPDATE
+from .models import UTC_NOW
+
 Base = declarative_base()
 
 class Message(Base):
@@ -47,17 +50,27 @@ class Message(Base):
     
     # Timestamps
     sent_at = Column(DateTime, nullable=False)
-    processed_at = Column(DateTime, default=datetime.utcnow)
-    
-    # Relationships
-    fraud_detections = relationship("FraudDetection", back_populates="message", cascade="all, delete-orphan")
+    processed_at = Column(DateTime, default=UTC_NOW)
+    
+    # Relationships (never lazy loaded: use selectinload, anything else raises)
+    fraud_detections = relationship(
+        "FraudDetection", back_populates="message", cascade="all, delete-orphan", lazy="raise"
+    )
+    
+    # Partial indexes, each over the rows one hot query reads: the (few)
+    # suspicious rows for the newest-suspicious listing, the rest for
+    # retention cleanup (is_suspicious = 0 AND processed_at < ?)
+    __table_args__ = (
+        Index('ix_msg_susp_partial', processed_at.desc(), sqlite_where=is_suspicious == True),
+        Index('ix_msg_expiry', processed_at, sqlite_where=is_suspicious == False),
+    )
 
 class FraudDetection(Base):
     """Detailed fraud detection results - only created for suspicious messages"""
     __tablename__ = 'fraud_detections'
     
     id = Column(Integer, primary_key=True)
-    message_id = Column(Integer, ForeignKey('messages.id'), nullable=False)
+    message_id = Column(Integer, ForeignKey('messages.id'), nullable=False, index=True)
     
     # Detection results
     fraud_score = Column(Float, nullable=False)
@@ -70,7 +83,7 @@ class FraudDetection(Base):
     alert_sent = Column(Boolean, default=False)
     alert_sent_at = Column(DateTime, nullable=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
     
     # Relationships
     message = relationship("Message", back_populates="fraud_detections")
@@ -85,8 +98,12 @@ class FraudKeyword(Base):
     fraud_score = Column(Float, default=0.7)  # Renamed from weight for clarity
     description = Column(String(500), nullable=True)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
+    updated_at = Column(DateTime, default=UTC_NOW, onupdate=UTC_NOW)
+    
+    __table_args__ = (
+        Index('ix_kw_active_cat', 'is_active', 'category'),
+    )
 
 class MonitoringSession(Base):
     """Session tracking for monitoring activities"""
@@ -96,7 +113,7 @@ class MonitoringSession(Base):
     session_name = Column(String(255), nullable=False)
     
     # Session timing
-    started_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, default=UTC_NOW)
     ended_at = Column(DateTime, nullable=True)
     
     # Statistics
@@ -110,6 +127,16 @@ class MonitoringSession(Base):
     
     is_active = Column(Boolean, default=True)
 
+# Environment settings are read once, on first use rather than at import, so a
+# load_dotenv() that runs after this module is imported is still honoured
+@lru_cache(maxsize=1)
+def _save_non_suspicious_default() -> bool:
+    return os.getenv('SAVE_NON_SUSPICIOUS_MESSAGES', 'true').lower() == 'true'
+
+@lru_cache(maxsize=1)
+def _save_all_media() -> bool:
+    return os.getenv('SAVE_ALL_MEDIA', 'false').lower() == 'true'
+
 # Configuration class for message saving behavior
 class MessageSavingConfig:
     """Configuration for controlling message saving behavior"""
@@ -135,9 +162,10 @@ class MessageSavingConfig:
             return session_config
         
         # Default from environment variable
-        return os.getenv('SAVE_NON_SUSPICIOUS_MESSAGES', 'true').lower() == 'true'
+        return _save_non_suspicious_default()
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_retention_days() -> int:
         """Get message retention period in days"""
         return int(os.getenv('MESSAGE_RETENTION_DAYS', '30'))
@@ -146,4 +174,4 @@ class MessageSavingConfig:
     def should_save_media(is_suspicious: bool) -> bool:
         """Determine if media files should be downloaded and saved"""
         # Only save media for suspicious messages to save space
-        return is_suspicious or os.getenv('SAVE_ALL_MEDIA', 'false').lower() == 'true'
\ No newline at end of file
+        return is_suspicious or _save_all_media()
\ No newline at end of file
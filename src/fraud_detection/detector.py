@@ -11,7 +11,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 import re
 import logging
-from typing import List, Dict, Tuple, Optional, Set
+from typing import List, Dict, Tuple, Optional, Set, FrozenSet
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -20,7 +20,7 @@ import math
 from colorama import Fore, Style
 
 from src.fraud_detection.keyword_manager import KeywordManager, FraudKeyword, FraudCategory
-from config.fraud_config import fraud_config
+from config.fraud_config import SUSPICIOUS_THRESHOLD
 
 
 @dataclass
@@ -69,13 +69,13 @@ class TextPreprocessor:
     """
     
     @staticmethod
-    def clean_text(text: str) -> str:
-        """Clean and normalize text for analysis"""
+    def clean_text(text: str, text_lower: Optional[str] = None) -> str:
+        """Clean and normalize text for analysis (text_lower: text already lowercased)"""
         if not text:
             return ""
             
         # Convert to lowercase
-        cleaned = text.lower()
+        cleaned = text_lower if text_lower is not None else text.lower()
         
         # Remove extra whitespace
         cleaned = re.sub(r'\s+', ' ', cleaned)
@@ -93,9 +93,9 @@ class TextPreprocessor:
         return words
     
     @staticmethod
-    def extract_phrases(text: str, max_phrase_length: int = 4) -> Set[str]:
+    def extract_phrases(text: str, max_phrase_length: int = 4, text_lower: Optional[str] = None) -> Set[str]:
         """Extract phrases of different lengths"""
-        cleaned_text = TextPreprocessor.clean_text(text)
+        cleaned_text = TextPreprocessor.clean_text(text, text_lower)
         words = cleaned_text.split()
         phrases = set()
         
@@ -139,7 +139,7 @@ class ContextualAnalyzer:
     ]
     
     @staticmethod
-    def analyze_context(text: str, context: Optional[Dict] = None) -> ContextualFactors:
+    def analyze_context(text: str, context: Optional[Dict] = None, text_lower: Optional[str] = None) -> ContextualFactors:
         """Analyze contextual factors in the text and metadata"""
         factors = ContextualFactors()
         
@@ -151,18 +151,19 @@ class ContextualAnalyzer:
         
         factors.message_length = len(text)
         
-        # Analyze text patterns
-        factors.urgency_indicators = ContextualAnalyzer._find_patterns(text, ContextualAnalyzer.URGENCY_PATTERNS)
-        factors.financial_terms = ContextualAnalyzer._find_patterns(text, ContextualAnalyzer.FINANCIAL_PATTERNS)
-        factors.contact_requests = ContextualAnalyzer._find_patterns(text, ContextualAnalyzer.CONTACT_PATTERNS)
+        # Analyze text patterns (lowercased once for all three pattern groups)
+        if text_lower is None:
+            text_lower = text.lower()
+        factors.urgency_indicators = ContextualAnalyzer._find_patterns(text_lower, ContextualAnalyzer.URGENCY_PATTERNS)
+        factors.financial_terms = ContextualAnalyzer._find_patterns(text_lower, ContextualAnalyzer.FINANCIAL_PATTERNS)
+        factors.contact_requests = ContextualAnalyzer._find_patterns(text_lower, ContextualAnalyzer.CONTACT_PATTERNS)
         
         return factors
     
     @staticmethod
-    def _find_patterns(text: str, patterns: List[str]) -> List[str]:
-        """Find matching patterns in text"""
+    def _find_patterns(text_lower: str, patterns: List[str]) -> List[str]:
+        """Find matching patterns in already-lowercased text"""
         matches = []
-        text_lower = text.lower()
         
         for pattern in patterns:
             found = re.findall(pattern, text_lower)
@@ -311,13 +312,61 @@ class FraudDetector:
         self.suspicious_threshold = 0.3
         self.high_risk_threshold = 0.7
         
-    def detect_fraud(self, text: str, context: Optional[Dict] = None) -> DetectionResult:
+        # Keyword pre-filter (one substring regex over keyword first words),
+        # rebuilt whenever the keyword manager's version changes
+        self._prefilter_version = None
+        self._prefilter: Optional[re.Pattern] = None
+        
+        # Keyword index: (keyword, words that must all appear), in manager order
+        self._index_version = None
+        self._keyword_index: Tuple[Tuple[FraudKeyword, FrozenSet[str]], ...] = ()
+    
+    def precompile(self) -> None:
+        """
+        Build the keyword index used by detection (no-op if keywords are unchanged).
+        
+        A keyword matches when every one of its words is an extracted phrase;
+        this covers both exact phrase hits and the partial multi-word rule.
+        """
+        if self._index_version == self.keyword_manager.version:
+            return
+        
+        self._keyword_index = tuple(
+            (keyword_obj, frozenset(keyword_obj.keyword.split()) if ' ' in keyword_obj.keyword
+             else frozenset((keyword_obj.keyword,)))
+            for keyword_obj in self.keyword_manager.get_all_keywords()
+        )
+        self._index_version = self.keyword_manager.version
+    
+    def could_match(self, text_lower: str) -> bool:
+        """
+        Cheap pre-check on lowercased text: False when no keyword can match.
+        
+        A keyword only matches if all of its words appear as tokens, so its
+        first word must occur somewhere in the text. One compiled substring
+        search checks that for every keyword; a True result still needs
+        detect_fraud to confirm.
+        """
+        if self._prefilter_version != self.keyword_manager.version:
+            first_words = {kw.keyword.split()[0] for kw in self.keyword_manager.get_all_keywords()}
+            self._prefilter = re.compile(
+                '|'.join(re.escape(word) for word in sorted(first_words))
+            ) if first_words else None
+            self._prefilter_version = self.keyword_manager.version
+        
+        if self._prefilter is None:
+            return False
+        
+        return self._prefilter.search(text_lower) is not None
+        
+    def detect_fraud(self, text: str, context: Optional[Dict] = None, text_lower: Optional[str] = None) -> DetectionResult:
         """
         Main fraud detection method with advanced contextual analysis
         
         Args:
             text: Text to analyze
             context: Optional context information (sender, group, etc.)
+            text_lower: Optional precomputed text.lower(), shared with other detectors
             
         Returns:
             DetectionResult: Comprehensive detection results
@@ -325,14 +374,17 @@ class FraudDetector:
         if not text or not text.strip():
             return self._create_empty_result()
             
+        if text_lower is None:
+            text_lower = text.lower()
+        
         # Preprocess text
-        phrases = self.preprocessor.extract_phrases(text)
+        phrases = self.preprocessor.extract_phrases(text, text_lower=text_lower)
         
         # Detect keywords
         detected_keywords = self._detect_keywords(phrases)
         
         # Analyze contextual factors
-        contextual_factors = self.contextual_analyzer.analyze_context(text, context)
+        contextual_factors = self.contextual_analyzer.analyze_context(text, context, text_lower)
         
         # Calculate advanced fraud score
         score_breakdown = self.advanced_calculator.calculate_advanced_score(
@@ -341,8 +393,8 @@ class FraudDetector:
         
         final_score = score_breakdown['final_score']
         
-        # Determine if suspicious using configuration
-        is_suspicious = fraud_config.is_suspicious(final_score)
+        # Determine if suspicious using the configured threshold
+        is_suspicious = final_score >= SUSPICIOUS_THRESHOLD
         
         # Create comprehensive analysis details
         analysis_details = {
@@ -372,25 +424,11 @@ class FraudDetector:
     
     def _detect_keywords(self, phrases: Set[str]) -> List[FraudKeyword]:
         """Detect fraud keywords in the given phrases"""
-        detected = []
-        all_keywords = self.keyword_manager.get_all_keywords()
+        self.precompile()
         
-        for keyword_obj in all_keywords:
-            keyword = keyword_obj.keyword
-            
-            # Exact match
-            if keyword in phrases:
-                detected.append(keyword_obj)
-                continue
-                
-            # Partial match for multi-word keywords
-            if ' ' in keyword:
-                # Check if all words of the keyword appear in the text
-                keyword_words = set(keyword.split())
-                if keyword_words.issubset(phrases):
-                    detected.append(keyword_obj)
-        
-        return detected
+        # Exact matches imply every word is present too, so one subset test per
+        # keyword covers both the exact and the partial multi-word rule
+        return [keyword_obj for keyword_obj, words in self._keyword_index if words <= phrases]
     
     def _get_advanced_confidence_level(self, score: float, keyword_count: int, 
                                      factors: ContextualFactors) -> str:
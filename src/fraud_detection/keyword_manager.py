@@ -58,6 +58,8 @@ class KeywordManager:
         self.logger = logging.getLogger(__name__)
         self.config_file = Path(config_file) if config_file else Path("fraud_keywords.json")
         self._keywords: Dict[str, FraudKeyword] = {}
+        # Bumped on every change so dependents can cache derived data
+        self.version = 0
         self._load_default_keywords()
         
     def _load_default_keywords(self) -> None:
@@ -127,6 +129,7 @@ class KeywordManager:
                 return False
                 
             self._keywords[fraud_keyword.keyword] = fraud_keyword
+            self.version += 1
             self.logger.info(f"{Fore.GREEN}✅ Added keyword: '{keyword}' (score: {score})")
             return True
             
@@ -148,6 +151,7 @@ class KeywordManager:
         
         if keyword_lower in self._keywords:
             del self._keywords[keyword_lower]
+            self.version += 1
             self.logger.info(f"{Fore.GREEN}✅ Removed keyword: '{keyword}'")
             return True
         else:
@@ -174,6 +178,7 @@ class KeywordManager:
         if keyword_lower in self._keywords:
             old_score = self._keywords[keyword_lower].score
             self._keywords[keyword_lower].score = new_score
+            self.version += 1
             self.logger.info(f"{Fore.GREEN}✅ Updated '{keyword}' score: {old_score} → {new_score}")
             return True
         else:
@@ -196,9 +201,9 @@ class KeywordManager:
         """Get keywords with fraud score above threshold"""
         return [kw for kw in self._keywords.values() if kw.score >= threshold]
     
-    def search_keywords(self, search_term: str) -> List[FraudKeyword]:
-        """Search keywords by partial match"""
-        search_lower = search_term.lower()
+    def search_keywords(self, search_term: str, prelowered: bool = False) -> List[FraudKeyword]:
+        """Search keywords by partial match (pass prelowered=True if search_term is already lowercase)"""
+        search_lower = search_term if prelowered else search_term.lower()
         return [kw for kw in self._keywords.values() if search_lower in kw.keyword]
     
     def export_to_json(self, file_path: Optional[str] = None) -> bool:
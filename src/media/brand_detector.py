@@ -6,10 +6,23 @@ It's designed to work with the existing OCR processing pipeline and fraud detect
 
 import re
 import json
+import hashlib
 from pathlib import Path
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Set, Optional, Tuple, NamedTuple
 from dataclasses import dataclass
 
+# Compiled matchers shared by every detector in the process, keyed by a hash
+# of the brand configuration they were built from
+_MATCHER_CACHE: Dict[str, list] = {}
+_MATCHER_CACHE_SIZE = 8
+
+class _BrandMatcher(NamedTuple):
+    """Compiled alternation over every brand pattern of one case mode."""
+    regex: re.Pattern
+    case_sensitive: bool
+    index: Dict[str, List[Tuple[str, str]]]  # matched text -> (brand_id, pattern) pairs
+    prefilter: re.Pattern  # same alternation without word boundaries, for could_match
+
 @dataclass
 class BrandMatch:
     """Represents a detected brand match in text."""
@@ -36,10 +49,15 @@ class BrandDetector:
         """
         self.brands_file = Path(brands_file)
         self.brands_config = {}
+        self._matchers: Optional[List[_BrandMatcher]] = None
+        # Bumped on every configuration change so dependents can cache results
+        self.version = 0
         self.load_brands()
     
     def load_brands(self):
         """Load brand configurations from JSON file."""
+        self._matchers = None
+        self.version += 1
         if not self.brands_file.exists():
             print(f"Brands file '{self.brands_file}' not found. Creating default configuration...")
             self._create_default_brands_file()
@@ -120,14 +138,17 @@ class BrandDetector:
             json.dump(default_brands, f, indent=2, ensure_ascii=False)
         
         self.brands_config = default_brands
+        self._matchers = None
+        self.version += 1
         print(f"Created default brands configuration with {len(default_brands)} brands")
     
-    def detect_brands(self, text: str) -> List[BrandMatch]:
+    def detect_brands(self, text: str, text_lower: Optional[str] = None) -> List[BrandMatch]:
         """
         Detect brand names in the given text.
         
         Args:
             text: Text to analyze (usually from OCR)
+            text_lower: Optional precomputed text.lower(), reused for case-insensitive brands
             
         Returns:
             List of BrandMatch objects for detected brands
@@ -135,42 +156,111 @@ class BrandDetector:
         if not text or not self.brands_config:
             return []
         
+        if self._matchers is None:
+            self._matchers = self._compile_matchers()
+        
         matches = []
+        lowered_text = text_lower
         
-        for brand_id, config in self.brands_config.items():
-            brand_matches = self._find_brand_matches(text, brand_id, config)
-            matches.extend(brand_matches)
+        # One scan per case mode covers every brand pattern at once
+        for matcher in self._matchers:
+            if matcher.case_sensitive:
+                search_text = text
+            else:
+                if lowered_text is None:
+                    lowered_text = text.lower()
+                search_text = lowered_text
+            
+            for match in matcher.regex.finditer(search_text):
+                for brand_id, pattern in matcher.index[match.group()]:
+                    config = self.brands_config[brand_id]
+                    confidence = self._calculate_confidence(match.group(), pattern, config)
+                    risk_level = self._assess_risk(confidence, config['risk_weight'])
+                    
+                    brand_match = BrandMatch(
+                        brand=config['name'],
+                        confidence=confidence,
+                        position=match.start(),
+                        matched_text=text[match.start():match.end()],  # Original case
+                        risk_level=risk_level
+                    )
+                    matches.append(brand_match)
         
         # Sort by position and remove duplicates
         matches = self._deduplicate_matches(matches)
         
         return matches
     
-    def _find_brand_matches(self, text: str, brand_id: str, config: Dict) -> List[BrandMatch]:
-        """Find all matches for a specific brand in the text."""
-        matches = []
-        search_text = text if config.get('case_sensitive', False) else text.lower()
+    def could_match(self, text: str, text_lower: Optional[str] = None) -> bool:
+        """
+        Cheap pre-check: False when no brand pattern can possibly occur in text.
         
-        for pattern in config['patterns']:
-            search_pattern = pattern if config.get('case_sensitive', False) else pattern.lower()
-            
+        Patterns are searched as plain substrings (word boundaries are not
+        checked), so a True result still needs detect_brands to confirm.
+        """
+        if not text or not self.brands_config:
+            return False
+        
+        if self._matchers is None:
+            self._matchers = self._compile_matchers()
+        
+        for matcher in self._matchers:
+            if matcher.case_sensitive:
+                search_text = text
+            else:
+                search_text = text_lower if text_lower is not None else text.lower()
+            if matcher.prefilter.search(search_text):
+                return True
+        
+        return False
+    
+    def _compile_matchers(self) -> List[_BrandMatcher]:
+        """Return the compiled matchers for the current configuration, reusing a cached build."""
+        signature = hashlib.sha256(
+            json.dumps(self.brands_config, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        ).hexdigest()
+        
+        matchers = _MATCHER_CACHE.get(signature)
+        if matchers is None:
+            if len(_MATCHER_CACHE) >= _MATCHER_CACHE_SIZE:
+                # Drop the oldest build
+                del _MATCHER_CACHE[next(iter(_MATCHER_CACHE))]
+            matchers = _MATCHER_CACHE[signature] = self._build_matchers()
+        
+        return matchers
+    
+    def _build_matchers(self) -> List[_BrandMatcher]:
+        """
+        Compile all brand patterns into one alternation regex per case mode.
+        
+        Returns:
+            List of _BrandMatcher, at most one per case mode
+        """
+        indexes: Dict[bool, Dict[str, List[Tuple[str, str]]]] = {False: {}, True: {}}
+        
+        for brand_id, config in self.brands_config.items():
+            case_sensitive = config.get('case_sensitive', False)
+            for pattern in config['patterns']:
+                search_pattern = pattern if case_sensitive else pattern.lower()
+                indexes[case_sensitive].setdefault(search_pattern, []).append((brand_id, pattern))
+        
+        matchers = []
+        for case_sensitive, pattern_index in indexes.items():
+            if not pattern_index:
+                continue
+            # Alternatives keep config order so the earliest-listed pattern wins at a
+            # position, as the per-pattern scan plus deduplication did
+            alternation = '|'.join(re.escape(p) for p in pattern_index)
             # Use word boundaries for better matching
-            regex_pattern = r'\b' + re.escape(search_pattern) + r'\b'
-            
-            for match in re.finditer(regex_pattern, search_text):
-                confidence = self._calculate_confidence(match.group(), pattern, config)
-                risk_level = self._assess_risk(confidence, config['risk_weight'])
-                
-                brand_match = BrandMatch(
-                    brand=config['name'],
-                    confidence=confidence,
-                    position=match.start(),
-                    matched_text=text[match.start():match.end()],  # Original case
-                    risk_level=risk_level
-                )
-                matches.append(brand_match)
+            regex = re.compile(r'\b(?:' + alternation + r')\b')
+            matchers.append(_BrandMatcher(
+                regex=regex,
+                case_sensitive=case_sensitive,
+                index=pattern_index,
+                prefilter=re.compile(alternation)
+            ))
         
-        return matches
+        return matchers
     
     def _calculate_confidence(self, matched_text: str, pattern: str, config: Dict) -> float:
         """Calculate confidence score for a match."""
@@ -323,6 +413,10 @@ class BrandDetector:
     
     def _save_brands_config(self):
         """Save current brands configuration to file."""
+        # Patterns may have changed; recompile on the next detection
+        self._matchers = None
+        self.version += 1
+        
         try:
             with open(self.brands_file, 'w', encoding='utf-8') as f:
                 json.dump(self.brands_config, f, indent=2, ensure_ascii=False)
@@ -76,7 +76,7 @@ class TelegramFraudMonitor:
             self.logger.info(f"{Fore.GREEN}✅ Successfully connected to Telegram!")
             
             # Initialize alert system after successful connection
-            self.alert_manager = AlertManager(telegram_client=self.client)
+            self.alert_manager = AlertManager(telegram_client=self.client, fraud_detector=self.fraud_detector)
             print(f"{Fore.CYAN}🚨 Alert system initialized - notifications enabled!")
             
             # Get user info
@@ -206,19 +206,21 @@ class TelegramFraudMonitor:
                         await self.send_fraud_alert(message, chat_title, ocr_fraud_result, extracted_text)
         
         try:
-            # Save message to database (with fraud detection if any)
+            # Save message to database (with fraud detection if any) and update
+            # session statistics; both are queued for the background writer,
+            # which commits them together, so the event loop never waits on disk
             fraud_result_data = fraud_result if fraud_detected else None
-            saved_message_id = self.db.save_message(message_data, fraud_result_data)
+            self.db.save_message(message_data, fraud_result_data, defer=True)
             
-            # Update session statistics
             if self.current_session:
                 self.db.update_session_stats(
                     self.current_session, 
                     messages_processed=1,
-                    fraud_alerts=1 if fraud_detected else 0
+                    fraud_alerts=1 if fraud_detected else 0,
+                    defer=True
                 )
             
-            print(f"{Fore.GREEN}💾 Message saved to database")
+            print(f"{Fore.GREEN}💾 Message queued for database")
             
         except Exception as e:
             self.logger.error(f"{Fore.RED}❌ Error saving to database: {e}")
@@ -351,7 +353,8 @@ class TelegramFraudMonitor:
         if self.current_session:
             self.db.update_session_stats(
                 self.current_session, 
-                messages_processed=1
+                messages_processed=1,
+                defer=True
             )
             
         return extracted_text, media_info
@@ -378,7 +381,7 @@ class TelegramFraudMonitor:
             # Use analyze_and_alert method which handles everything internally
             alert = await self.alert_manager.analyze_and_alert(context)
             if alert:
-                print(f"{Fore.GREEN}📨 Alert notification sent!")
+                print(f"{Fore.GREEN}📨 Alert notification queued!")
             else:
                 print(f"{Fore.YELLOW}⚠️  Alert not sent (rate limited or low risk)")
             
@@ -411,6 +414,10 @@ class TelegramFraudMonitor:
             self.db.close()
             print(f"{Fore.GREEN}🔒 Database connection closed")
         
+        # Deliver any queued alerts before the client goes away
+        if self.alert_manager:
+            await self.alert_manager.close()
+        
         # Disconnect Telegram client
         if self.client.is_connected():
             await self.client.disconnect()
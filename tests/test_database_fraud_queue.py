@@ -0,0 +1,43 @@
+"""
+Batched fraud detection insert tests for DatabaseManager.queue_fraud_detection
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+from sqlalchemy import select
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from database.database import DatabaseManager
+from database.models import FraudDetection
+
+
+class FraudQueueRetryTest(unittest.IsolatedAsyncioTestCase):
+    """A row that cannot be inserted must not drop the rest of its batch"""
+    
+    async def asyncSetUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.url = f"sqlite+aiosqlite:///{os.path.join(self._tmp.name, 'test.db')}"
+        self.db = DatabaseManager(self.url)
+        await self.db.initialize_database()
+    
+    async def asyncTearDown(self):
+        await self.db.close()
+        self._tmp.cleanup()
+    
+    async def test_bad_row_loses_only_itself(self):
+        detection = {'is_suspicious': True, 'fraud_score': 0.9, 'detection_method': 'keyword'}
+        for message_id in (1, 2, None, 3):
+            await self.db.queue_fraud_detection(message_id, detection)
+        await self.db._fraud_queue.join()
+        
+        async with self.db.async_session() as session:
+            message_ids = (await session.execute(select(FraudDetection.message_id))).scalars().all()
+        self.assertEqual(sorted(message_ids), [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Keyset pagination tests for DatabaseManager.get_recent_messages / iter_messages
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from database.database import DatabaseManager
+
+
+class RecentMessagesPagingTest(unittest.IsolatedAsyncioTestCase):
+    """Pages must not skip or repeat rows that share a processed_at value"""
+    
+    async def asyncSetUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(f"sqlite+aiosqlite:///{os.path.join(self._tmp.name, 'test.db')}")
+        await self.db.initialize_database()
+        await self.db.save_messages([
+            {'group_id': 'g1', 'group_name': 'Group', 'sender_id': 'u1',
+             'message_id': str(i), 'sent_at': datetime.utcnow()}
+            for i in range(6)
+        ])
+        
+        # All rows on one whole-second timestamp (microsecond == 0)
+        async with self.db.engine.begin() as conn:
+            await conn.execute(text("UPDATE messages SET processed_at = '2026-01-01 12:00:00.000000'"))
+    
+    async def asyncTearDown(self):
+        await self.db.close()
+        self._tmp.cleanup()
+    
+    async def test_pages_cross_whole_second_timestamp(self):
+        first = await self.db.get_recent_messages(2)
+        self.assertEqual(first[-1].processed_at.microsecond, 0)
+        
+        second = await self.db.get_recent_messages(2, before=(first[-1].processed_at, first[-1].id))
+        self.assertEqual([m.id for m in first + second], [6, 5, 4, 3])
+    
+    async def test_iter_messages_yields_every_row(self):
+        ids = [m.id async for m in self.db.iter_messages(batch_size=2)]
+        self.assertEqual(ids, [6, 5, 4, 3, 2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Session counter batching tests for DatabaseManager.add_session_stats / close
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+
+from sqlalchemy import select
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from database import database as database_module
+from database.database import DatabaseManager
+from database.models import MonitoringSession
+
+
+class SessionStatsCloseTest(unittest.IsolatedAsyncioTestCase):
+    """close() must not drop counter deltas that a running flush already took"""
+    
+    async def asyncSetUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.url = f"sqlite+aiosqlite:///{os.path.join(self._tmp.name, 'test.db')}"
+        self.db = DatabaseManager(self.url)
+        await self.db.initialize_database()
+    
+    async def asyncTearDown(self):
+        self._tmp.cleanup()
+    
+    async def test_close_during_flush_keeps_deltas(self):
+        first = await self.db.create_monitoring_session('first', [])
+        second = await self.db.create_monitoring_session('second', [])
+        
+        # Slow writes so close() lands while the background flush is running
+        update_session_stats = self.db.update_session_stats
+        
+        async def slow_update(*args, **kwargs):
+            await asyncio.sleep(0.2)
+            return await update_session_stats(*args, **kwargs)
+        
+        self.db.update_session_stats = slow_update
+        self.db.add_session_stats(first.id, messages_count=5)
+        self.db.add_session_stats(second.id, messages_count=7)
+        await asyncio.sleep(database_module.SESSION_STATS_FLUSH_INTERVAL + 0.05)
+        await self.db.close()
+        
+        reader = DatabaseManager(self.url)
+        try:
+            async with reader.async_session() as session:
+                rows = (await session.execute(select(MonitoringSession))).scalars().all()
+            self.assertEqual({row.session_name: row.messages_processed for row in rows},
+                             {'first': 5, 'second': 7})
+        finally:
+            await reader.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
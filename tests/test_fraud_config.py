@@ -0,0 +1,30 @@
+"""
+Level lookup tests for FraudDetectionConfig
+"""
+
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.fraud_config import fraud_config
+
+
+class LevelLookupTest(unittest.TestCase):
+    """Quantized lookups keep the original range semantics, including bad floats"""
+    
+    def test_non_finite_scores_take_the_top_level(self):
+        for score in (math.nan, math.inf, -math.inf):
+            self.assertEqual(fraud_config.get_risk_level(score), 'CRITICAL')
+            self.assertEqual(fraud_config.get_confidence_level(1, score), 'HIGH')
+    
+    def test_risk_level_boundaries(self):
+        cases = {0.0: 'LOW', 0.29: 'LOW', 0.3: 'MEDIUM', 0.7: 'HIGH', 0.9: 'CRITICAL', 1.0: 'CRITICAL', -0.5: 'CRITICAL'}
+        for score, level in cases.items():
+            self.assertEqual(fraud_config.get_risk_level(score), level, score)
+
+
+if __name__ == '__main__':
+    unittest.main()
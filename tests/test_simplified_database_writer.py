@@ -0,0 +1,84 @@
+"""
+Deferred write tests for SimplifiedDatabaseManager's background writer
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from database.simplified_database import SimplifiedDatabaseManager
+from database.simplified_models import MonitoringSession
+
+
+class DeferredWriteTest(unittest.TestCase):
+    """Deferred messages and counters are committed by the writer, not the caller"""
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = SimplifiedDatabaseManager(os.path.join(self._tmp.name, 'test.db'))
+        self.session_id = self.db.start_monitoring_session('test', ['group'])
+    
+    def tearDown(self):
+        self.db.close()
+        self._tmp.cleanup()
+    
+    def _message(self, number):
+        return {'message_id': number, 'group_id': 1, 'sender_id': 2, 'sent_at': datetime.utcnow()}
+    
+    def _counters(self):
+        with self.db.get_session() as session:
+            row = session.get(MonitoringSession, self.session_id)
+            return row.messages_processed, row.suspicious_messages, row.fraud_alerts
+    
+    def test_messages_and_counters_written_together(self):
+        fraud = {'is_suspicious': True, 'fraud_score': 0.9, 'detected_keywords': ['scam']}
+        for number in range(10):
+            suspicious = number % 2 == 0
+            self.db.save_message(self._message(number), fraud if suspicious else None, session_config=True, defer=True)
+            self.db.update_session_stats(self.session_id, messages_processed=1,
+                                         fraud_alerts=1 if suspicious else 0, defer=True)
+        
+        self.db.flush_pending()
+        stats = self.db.get_database_stats()
+        self.assertEqual((stats['total_messages'], stats['fraud_detections']), (10, 5))
+        self.assertEqual(self._counters(), (10, 0, 5))
+    
+    def test_bad_message_loses_only_itself(self):
+        self.db.save_message({'message_id': 'broken'}, None, session_config=True, defer=True)
+        for number in range(3):
+            self.db.save_message(self._message(number), None, session_config=True, defer=True)
+        self.db.update_session_stats(self.session_id, messages_processed=4, defer=True)
+        
+        self.db.flush_pending()
+        self.assertEqual(self.db.get_database_stats()['total_messages'], 3)
+        self.assertEqual(self._counters(), (4, 0, 0))
+
+
+
+class InMemoryDeferredWriteTest(unittest.TestCase):
+    """An in-memory database is shared with the writer thread, not reopened empty"""
+    
+    def setUp(self):
+        self.db = SimplifiedDatabaseManager(':memory:')
+    
+    def tearDown(self):
+        self.db.close()
+    
+    def test_deferred_messages_reach_memory_database(self):
+        # Keep a connection checked out so the writer cannot simply reuse the caller's
+        with self.db.engine.connect():
+            for number in range(5):
+                self.db.save_message({'message_id': number, 'group_id': 1, 'sender_id': 2, 'sent_at': datetime.utcnow()},
+                                     None, session_config=True, defer=True)
+            
+            self.db.flush_pending()
+        
+        self.assertEqual(self.db.get_database_stats()['total_messages'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()